@@ -1,10 +1,12 @@
 import sys
 import os
+import importlib
+from functools import partial
 
 # Import PyQt5 modules
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QTextEdit, QFrame, QGroupBox, QTabWidget,
+    QLabel, QPushButton, QFrame, QGroupBox, QTabWidget,
     QDialog, QSizePolicy
 )
 from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal
@@ -19,17 +21,39 @@ except ImportError:
 
 # Import classes from your new modules
 from modules.login import LoginDialog
-from modules.log_tab import LogTab
-from modules.stats import StatisticsTab
-from modules.actions import ActionsTab
-from modules.html_parser import HtmlToTextTab
-from modules.leads import LeadsTab
-from modules.email_sent import EmailSentTab
-from modules.contacts import SellerFollowupTab
-from modules.metabase import EmailGeneratorTab
 from modules.welcome import WelcomeWindow
-from modules.template_management_tab import TemplateManagementTab
-from modules.spreadsheet import DataExtractionTab
+from modules.output_console import OutputConsole
+
+OUTPUT_LOG_FILE = os.path.join("other", "output_console.log")
+
+# Tab name -> "module:Class". Tab modules are imported when the tab is first
+# opened, so their dependencies (QtChart, fpdf, cryptography, bs4, ...) do
+# not slow down startup. tests/test_import_time.py checks this stays true.
+TABS = {
+    "Leads Template": "modules.leads:LeadsTab",
+    "Leads Follow-up": "modules.email_sent:EmailSentTab",
+    "Contacts": "modules.contacts:SellerFollowupTab",
+    "Metabase": "modules.metabase:EmailGeneratorTab",
+    "Temporal Logs": "modules.log_tab:LogTab",
+    "Statistics": "modules.stats:StatisticsTab",
+    "Instructions": "modules.actions:ActionsTab",
+    "HTML2Text": "modules.html_parser:HtmlToTextTab",
+    "Templates Manager": "modules.template_management_tab:TemplateManagementTab",
+    "Spreadsheet": "modules.spreadsheet:DataExtractionTab"
+}
+
+# List of tabs that need a reference to the main window
+TABS_NEEDING_MAIN_WINDOW = ["Instructions", "Temporal Logs", "Leads Template"]
+
+
+def load_class(path):
+    """Imports "package.module:Class" and returns the class."""
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_tab(path, *args, **kwargs):
+    return load_class(path)(*args, **kwargs)
 
 class MainWindow(QMainWindow):
     # Signal to notify other widgets when the theme has changed.
@@ -75,51 +99,37 @@ class MainWindow(QMainWindow):
         logo_layout.addWidget(welcome_button)
         main_layout.addWidget(logo_frame)
 
+        # Output Console (created first: a tab may report output while it is built)
+        output_group_box = QGroupBox("Application Output")
+        output_layout = QVBoxLayout(output_group_box)
+        os.makedirs(os.path.dirname(OUTPUT_LOG_FILE), exist_ok=True)
+        self.output_console = OutputConsole(log_path=OUTPUT_LOG_FILE)
+        output_layout.addWidget(self.output_console)
+
         # Tabs
         self.notebook = QTabWidget()
         main_layout.addWidget(self.notebook)
         
-        # Tab definitions using imported classes
-        tabs = {
-            "Leads Template": LeadsTab,
-            "Leads Follow-up": EmailSentTab,
-            "Contacts": SellerFollowupTab,
-            "Metabase": EmailGeneratorTab,
-            "Temporal Logs": LogTab,
-            "Statistics": StatisticsTab,
-            "Instructions": ActionsTab,
-            "HTML2Text": HtmlToTextTab,
-            "Templates Manager": TemplateManagementTab,
-            "Spreadsheet": DataExtractionTab
-        }
-
-        # List of tabs that need a reference to the main window
-        tabs_needing_main_window = ["Instructions", "Temporal Logs", "Leads Template"]
-
-        for name, TabClass in tabs.items():
+        # Tabs are built the first time they are shown; until then an empty
+        # placeholder holds their place in the notebook
+        self.tab_factories = {}  # index -> (name, factory) of tabs not built yet
+        for name, path in TABS.items():
             # Pass main_window reference if the tab's name is in the list
-            if name in tabs_needing_main_window:
-                tab = TabClass(self.notebook, main_window=self)
+            if name in TABS_NEEDING_MAIN_WINDOW:
+                factory = partial(create_tab, path, self.notebook, main_window=self)
             else:
-                tab = TabClass(self.notebook)
+                factory = partial(create_tab, path, self.notebook)
+            index = self.notebook.addTab(QWidget(), name)
+            self.tab_factories[index] = (name, factory)
 
-            if hasattr(tab, 'output_message'):
-                tab.output_message.connect(self.insert_output)
-            self.notebook.addTab(tab, name)
+        self.notebook.currentChanged.connect(self.build_tab)
 
-        # Output Console
-        output_group_box = QGroupBox("Application Output")
-        output_layout = QVBoxLayout(output_group_box)
-        self.output_text_edit = QTextEdit()
-        self.output_text_edit.setObjectName("output_console")
-        self.output_text_edit.setReadOnly(True)
-        self.output_text_edit.setFont(QFont("Courier", 10))
-        output_layout.addWidget(self.output_text_edit)
         main_layout.addWidget(output_group_box)
         main_layout.setStretchFactor(self.notebook, 3)
         main_layout.setStretchFactor(output_group_box, 1)
 
         self.insert_output("Welcome to the Integrated Email Tools!\n" + "="*70 + "\n")
+        self.build_tab(self.notebook.currentIndex())
 
     def apply_stylesheet(self, dark_mode=False):
         # 1. Define the color palettes
@@ -172,9 +182,27 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(str)
     def insert_output(self, message):
-        self.output_text_edit.moveCursor(self.output_text_edit.textCursor().End)
-        self.output_text_edit.insertPlainText(message)
-        self.output_text_edit.ensureCursorVisible()
+        # Batched: the console appends queued messages together every few milliseconds
+        self.output_console.write(message)
+
+    @pyqtSlot(int)
+    def build_tab(self, index):
+        """Replaces the placeholder at 'index' with the real tab, once."""
+        if index not in self.tab_factories:
+            return
+        name, factory = self.tab_factories.pop(index)
+        tab = factory()
+        if hasattr(tab, 'output_message'):
+            tab.output_message.connect(self.insert_output)
+
+        placeholder = self.notebook.widget(index)
+        # Swapping the page would change the current tab twice; nobody needs to hear it
+        self.notebook.blockSignals(True)
+        self.notebook.removeTab(index)
+        self.notebook.insertTab(index, tab, name)
+        self.notebook.setCurrentIndex(index)
+        self.notebook.blockSignals(False)
+        placeholder.deleteLater()
 
     @pyqtSlot(int) 
     def switch_to_tab(self, index):
@@ -184,26 +212,35 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Ensure background threads are stopped gracefully on close."""
         print("Closing application. Resetting all tab processes...")
+        # Placeholders of tabs never opened have nothing to reset
         for i in range(self.notebook.count()):
             tab = self.notebook.widget(i)
             if hasattr(tab, 'reset_process'):
                 # This call will now block until the thread is safely stopped
                 tab.reset_process()
         
+        self.output_console.close_log()
         print("All threads stopped. Exiting.")
         event.accept() # Allow the window to close
 
-if __name__ == "__main__":
+def main(argv):
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
     app.setStyle("Fusion")
 
-    login = LoginDialog()
-    if login.exec_() == QDialog.Accepted:
-        main_window = MainWindow()
-        main_window.show()
-        main_window.open_welcome_window()
-        sys.exit(app.exec_())
-    else:
-        sys.exit(0)
+    # --skip-login is for headless profiling runs (QT_QPA_PLATFORM=offscreen,
+    # see tests/profile_startup.py); it is ignored on a real display
+    skip_login = "--skip-login" in argv and os.environ.get("QT_QPA_PLATFORM") == "offscreen"
+    if not skip_login:
+        login = LoginDialog()
+        if login.exec_() != QDialog.Accepted:
+            return 0
+
+    main_window = MainWindow()
+    main_window.show()
+    main_window.open_welcome_window()
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -8,6 +8,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel, QPushBut
 from PyQt5.QtCore import pyqtSignal
 # email_logic is still needed, but Worker and QThread are not
 from .email_logic import get_seller_followup_email_generator
+from .event_recorder import record_event, CONTACTS
 
 class SellerFollowupTab(QWidget):
     output_message = pyqtSignal(str)
@@ -96,6 +97,7 @@ class SellerFollowupTab(QWidget):
         try:
             data = next(self.email_generator_obj)
             pyperclip.copy(data["message"])
+            record_event(CONTACTS)
             self.email_display_text.setText(data["message"])
             info = f"Row {data.get('row_index', 'N/A')} | Email: {data['email']}"
             self.current_info_label.setText(f"Current: {info}")
@@ -6,6 +6,8 @@ from PyQt5.QtCore import pyqtSignal
 import pyperclip
 import json
 
+from .event_recorder import record_event, EMAIL_SENT
+
 class EmailSentTab(QWidget):
     output_message = pyqtSignal(str)
 
@@ -78,6 +80,7 @@ class EmailSentTab(QWidget):
             # Asume que queremos la primera plantilla para este módulo
             template_text = self.templates[lang][0] 
             pyperclip.copy(template_text)
+            record_event(EMAIL_SENT)
             self.click_counts[lang] += 1
             self.status_label.setText(f"✅ {lang.upper()} template copied!")
             self.update_counters()
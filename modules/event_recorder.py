@@ -0,0 +1,160 @@
+# modules/event_recorder.py
+
+"""
+Automatic usage counters for the Statistics tab.
+
+Tabs call record_event("Template Leads") when they copy something. The
+call only appends to an in-memory buffer; a background thread writes the
+buffer to an append-only events file in batches and folds the file into
+the StatsStore (per-day counts and rollups) in one transaction.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+from .stats_store import StatsStore, DB_FILE
+
+EVENTS_FILE = Path("other/stats_events.log")
+
+# Metric names, matching StatisticsTab.stats_keys
+TEMPLATE_LEADS = "Template Leads"
+EMAIL_SENT = "Email-Sent"
+CONTACTS = "Contacts"
+METABASE = "Metabase"
+
+
+class EventRecorder:
+    def __init__(self, events_file=EVENTS_FILE, db_path=DB_FILE, flush_interval=2.0, batch_size=50):
+        self.events_file = Path(events_file)
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.buffer = []
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.store = None  # opened by the aggregator thread
+        self.last_batch = 0.0
+        self.thread = threading.Thread(target=self._run, name="stats-aggregator", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def record(self, metric, count=1):
+        """Queues one event. Cheap enough to call on every click."""
+        with self.lock:
+            self.buffer.append((time.time(), metric, count))
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.wake.set()
+
+    def add_listener(self, callback):
+        """callback({(day_str, metric): delta}) runs on the aggregator thread after each fold."""
+        with self.lock:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self.lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+    def _run(self):
+        # Opening the store migrates the legacy JSON if the Statistics tab has not yet
+        self.store = StatsStore(self.db_path)
+        self.last_batch = self.store.last_batch()
+        self.fold_pending()
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+                self.fold()
+            except (OSError, sqlite3.Error) as e:
+                # Events stay in the file (or the .folding file) for the next round
+                print(f"[EventRecorder] Could not fold events: {e}")
+
+    def flush(self):
+        """Appends the buffered events to the events file in one write."""
+        with self.lock:
+            events, self.buffer = self.buffer, []
+        if not events:
+            return
+        self.events_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.events_file, "a", encoding="utf-8") as f:
+            f.write("".join(f"{ts:.3f}\t{metric}\t{count}\n" for ts, metric, count in events))
+
+    def fold(self):
+        """Moves the events file aside and folds it into the stats store."""
+        if not self.events_file.exists():
+            return
+        # Ids must increase (see StatsStore.add_counts), even if the clock goes back
+        batch_id = f"{max(time.time(), self.last_batch + 0.001):.6f}"
+        folding = self.events_file.with_name(f"{self.events_file.name}.{batch_id}.folding")
+        os.replace(self.events_file, folding)
+        self._fold_file(folding, batch_id)
+
+    def fold_pending(self):
+        """Finishes folds interrupted by a crash (each batch is applied at most once)."""
+        pending = {path.name[len(self.events_file.name) + 1:-len(".folding")]: path
+                   for path in self.events_file.parent.glob(f"{self.events_file.name}.*.folding")}
+        for batch_id in sorted(pending, key=float):
+            self._fold_file(pending[batch_id], batch_id)
+
+    def _fold_file(self, path, batch_id):
+        counts = Counter()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 3:
+                    continue
+                try:
+                    day = date.fromtimestamp(float(parts[0])).isoformat()
+                    counts[(day, parts[1])] += float(parts[2])
+                except ValueError:
+                    continue
+        applied = self.store.add_counts(counts, batch_id)
+        self.last_batch = max(self.last_batch, float(batch_id))
+        path.unlink()
+        if applied and counts:
+            with self.lock:
+                listeners = list(self.listeners)
+            for callback in listeners:
+                try:
+                    callback(dict(counts))
+                except Exception as e:  # a listener must not stop the aggregator
+                    print(f"[EventRecorder] Listener failed: {e}")
+
+    def stop(self):
+        """Writes out and folds whatever is still buffered."""
+        self.stopping = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+            self.flush()
+            self.fold()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    """The process-wide recorder, started on first use and stopped at exit."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = EventRecorder()
+            _recorder.start()
+            atexit.register(_recorder.stop)
+        return _recorder
+
+
+def record_event(metric, count=1):
+    get_recorder().record(metric, count)
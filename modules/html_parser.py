@@ -1,7 +1,5 @@
 import sys
-import requests
 import re
-from bs4 import BeautifulSoup, NavigableString
 from urllib.parse import urljoin, urlencode
 
 from PyQt5.QtWidgets import (
@@ -45,6 +43,10 @@ class Worker(QObject):
         """
         Fetches a URL and performs contextual text and link extraction.
         """
+        # Imported on first use: requests and bs4 are among the slowest imports of the app
+        import requests
+        from bs4 import BeautifulSoup, NavigableString
+
         try:
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
             response = requests.get(url, headers=headers, timeout=15)
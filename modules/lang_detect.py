@@ -0,0 +1,175 @@
+# modules/lang_detect.py
+
+"""
+Scored language detection for lead messages. The keywords of every
+'language_detect' rule are compiled into one Aho-Corasick automaton, so a
+single pass over the text counts the hits of all languages at once.
+Patterns that are not keyword lists are matched through regex_guard, like
+extraction rules, and count nothing when they time out.
+"""
+
+import re
+from collections import deque
+
+from .regex_guard import RULE_TIMEOUT, RegexTimeout, guarded_count
+
+REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+
+
+def split_alternatives(pattern):
+    """Splits a pattern on its top-level '|' (ignores '|' inside groups, classes or escapes)."""
+    parts, current, depth, in_class, escaped = [], [], 0, False, False
+    for char in pattern:
+        if escaped:
+            current.append(char)
+            escaped = False
+            continue
+        if char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def literal_keyword(alternative):
+    """Returns the literal text an alternative matches, or None if it uses regex syntax."""
+    chars, escaped = [], False
+    for char in alternative:
+        if escaped:
+            # '\.' is a literal dot, but '\s', '\d', '\b'... are character classes
+            if char.isalnum():
+                return None
+            chars.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in REGEX_SPECIAL:
+            return None
+        else:
+            chars.append(char)
+    if escaped or not chars:
+        return None
+    return ''.join(chars)
+
+
+class AhoCorasick:
+    """Minimal Aho-Corasick automaton over lowercase keywords."""
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, payload)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for keyword, payload in keywords:
+            state = 0
+            for char in keyword:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append(payload)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                # Inherit the matches of the longest proper suffix
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter_matches(self, text):
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class LanguageDetector:
+    """
+    Counts keyword hits for every language in one pass and returns the best
+    scoring language with a confidence (its share of all hits).
+    """
+
+    def __init__(self, rules, default="en"):
+        self.default = default
+        self.languages = []
+        keywords = []
+        self.regex_rules = []  # rules that are not plain keyword lists
+        for rule in rules:
+            if rule.get('type') != 'language_detect' or not rule.get('value') or not rule.get('pattern'):
+                continue
+            lang = rule['value']
+            if lang not in self.languages:
+                self.languages.append(lang)
+            alternatives = [literal_keyword(alt) for alt in split_alternatives(rule['pattern'])]
+            if all(alternatives):
+                keywords.extend((keyword.lower(), lang) for keyword in alternatives)
+            else:
+                try:
+                    re.compile(rule['pattern'])
+                except re.error as e:
+                    print(f"Regex error in rule '{rule.get('name')}': {e}")
+                    continue
+                self.regex_rules.append((rule['pattern'], lang, rule.get('name')))
+        self.automaton = AhoCorasick(keywords)
+
+    def scores(self, text, timeout=RULE_TIMEOUT):
+        text_lower = text.lower()
+        scores = dict.fromkeys(self.languages, 0)
+        for lang in self.automaton.iter_matches(text_lower):
+            scores[lang] += 1
+        for pattern, lang, name in self.regex_rules:
+            try:
+                scores[lang] += guarded_count(pattern, text_lower, re.IGNORECASE, timeout)
+            except RegexTimeout:
+                print(f"Rule '{name}' timed out and was skipped.")
+        return scores
+
+    def detect(self, text, timeout=RULE_TIMEOUT):
+        """Returns (language, confidence). Ties go to the rule listed first."""
+        scores = self.scores(text, timeout)
+        total = sum(scores.values())
+        if not total:
+            return self.default, 0.0
+        best = max(self.languages, key=lambda lang: scores[lang])
+        return best, scores[best] / total
+
+
+_detector_cache = {}
+
+
+def get_detector(rules):
+    """Returns a detector for these rules, reusing the automaton while the rules are unchanged."""
+    key = tuple((r.get('type'), r.get('value'), r.get('pattern')) for r in rules
+                if r.get('type') == 'language_detect')
+    detector = _detector_cache.get(key)
+    if detector is None:
+        _detector_cache.clear()
+        detector = _detector_cache[key] = LanguageDetector(rules)
+    return detector
@@ -0,0 +1,118 @@
+# modules/lead_batch.py
+
+"""
+Batch parsing of lead enquiries from a mailbox export (an mbox file or a
+folder of .eml files). This module does not import PyQt5 so the parsing can
+run inside worker processes.
+"""
+
+import email
+import functools
+import html
+import mailbox
+import os
+import re
+from email import policy
+
+from .lead_core import RULE_TIMEOUT, detect_language_scored, missing_fields, parse_input
+
+# Below this many messages the cost of starting worker processes is higher
+# than the parsing itself, so the batch stays in-process.
+PARALLEL_THRESHOLD = 50
+
+
+def message_to_text(msg):
+    """Returns the plain text body of an email, falling back to stripped HTML."""
+    body = msg.get_body(preferencelist=('plain', 'html'))
+    if body is None:
+        return ""
+    try:
+        content = body.get_content()
+    except (LookupError, UnicodeDecodeError):
+        content = body.get_payload(decode=True).decode('utf-8', errors='replace')
+    if body.get_content_type() == 'text/html':
+        content = re.sub(r'(?is)<(script|style).*?</\1>', '', content)
+        content = re.sub(r'(?i)<br\s*/?>|</p>|</div>', '\n', content)
+        content = html.unescape(re.sub(r'<[^>]+>', '', content))
+    return content.strip()
+
+
+def _read_message(file_obj):
+    return email.message_from_binary_file(file_obj, policy=policy.default)
+
+
+def iter_messages(path):
+    """Yields (source, subject, text) for every message in an mbox file or a .eml folder."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith('.eml'):
+                continue
+            with open(os.path.join(path, name), 'rb') as f:
+                msg = _read_message(f)
+            yield name, str(msg.get('subject', '')), message_to_text(msg)
+    else:
+        box = mailbox.mbox(path, factory=_read_message, create=False)
+        try:
+            for i, msg in enumerate(box):
+                yield f"#{i + 1}", str(msg.get('subject', '')), message_to_text(msg)
+        finally:
+            box.close()
+
+
+def process_message(text, rules, timeout=RULE_TIMEOUT):
+    """Detects the language and extracts the fields of one message."""
+    data = parse_input(text, rules, timeout)
+    language, confidence = detect_language_scored(text, rules, timeout)
+    return {
+        "language": language,
+        "confidence": confidence,
+        "data": data,
+        "missing": missing_fields(data),
+    }
+
+
+def message_timeout(rules, timeout=RULE_TIMEOUT):
+    """Longest a guarded message can take: every rule hitting its own limit, plus some slack."""
+    guarded = sum(1 for rule in rules if rule.get('type') in ('extraction', 'language_detect'))
+    return timeout * (guarded + 2)
+
+
+def parse_batch(texts, rules, max_workers=None):
+    """
+    Parses a list of message texts, in parallel worker processes for large
+    batches. Each message gets message_timeout seconds in a worker: without
+    the 'regex' package the rules cannot be interrupted inside a worker, so
+    after the first message that runs over, the pool is killed and the rest
+    of the batch is parsed in-process, where every rule is guarded.
+    """
+    worker = functools.partial(process_message, rules=rules)
+    if len(texts) < PARALLEL_THRESHOLD:
+        return [worker(text) for text in texts]
+    # Imported here: multiprocessing is the slowest import of the parsing core
+    import multiprocessing
+    workers = max_workers or os.cpu_count() or 1
+    limit = message_timeout(rules)
+    results = []
+    # Leaving the block terminates the pool, including a worker stuck in a rule
+    with multiprocessing.Pool(processes=workers) as pool:
+        jobs = [pool.apply_async(worker, (text,)) for text in texts]
+        for job in jobs:
+            try:
+                results.append(job.get(limit))
+            except multiprocessing.TimeoutError:
+                print(f"[LeadBatch] Message {len(results) + 1} exceeded {limit:.1f}s in a worker; "
+                      f"parsing the remaining {len(texts) - len(results)} messages in-process.")
+                break
+    results.extend(worker(text) for text in texts[len(results):])
+    return results
+
+
+def load_and_parse(path, rules, max_workers=None):
+    """Reads every message under 'path' and returns one result dict per message."""
+    messages = [m for m in iter_messages(path) if m[2]]
+    parsed = parse_batch([text for _, _, text in messages], rules, max_workers)
+    results = []
+    for (source, subject, text), result in zip(messages, parsed):
+        result.update({"source": source, "subject": subject, "text": text})
+        results.append(result)
+    return results
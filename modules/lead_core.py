@@ -0,0 +1,151 @@
+# modules/lead_core.py
+
+"""
+Qt-free lead processing core: language detection, field extraction and
+template rendering for client enquiries. LeadsTab is a thin UI on top of
+LeadProcessor; batch jobs, benchmarks and worker processes use it directly
+without PyQt5, pyautogui or a display server.
+"""
+
+import json
+import os
+import random
+import re
+
+from .lang_detect import get_detector
+from .regex_guard import RULE_TIMEOUT, RegexTimeout, guarded_search
+
+FIELDS = ("name", "machine", "location", "link")
+
+RULES_FILE = "regex/parsing_rules.json"
+TEMPLATES_FILE = "templates/leads_templates.json"
+
+DEFAULT_RULES = [
+    {"name": "Detect Language: French", "type": "language_detect", "value": "fr", "pattern": "bonjour|votre intérêt|localisation"},
+    {"name": "Detect Language: Italian", "type": "language_detect", "value": "it", "pattern": "buongiorno|gentile|località|interesse per"},
+    {"name": "Extract: Client Name", "type": "extraction", "value": "name", "pattern": "(?:Dear|Hello|Bonjour|Cher|Gentile|Ciao)\\s+([\\w\\s.'-]+?)\\s*,"},
+    {"name": "Extract: Machine Name", "type": "extraction", "value": "machine", "pattern": "(?:interest in our machine|machine|votre intérêt pour notre machine|interesse per (?:la|la nostra) macchina)\\s*:\\s*([^\\r\\n]*)"},
+    {"name": "Extract: Location", "type": "extraction", "value": "location", "pattern": "(?:Location|Localisation|Località)\\s*:\\s*([^\\r\\n]*)"}
+]
+
+DEFAULT_TEMPLATES = {"en": ["Hello {client_name}, ..."], "it": [], "fr": []}
+
+
+def detect_language_scored(text, rules, timeout=RULE_TIMEOUT):
+    """Returns (language, confidence) using the single-pass keyword detector."""
+    return get_detector(rules).detect(text, timeout)
+
+
+def detect_language(text, rules, timeout=RULE_TIMEOUT):
+    return detect_language_scored(text, rules, timeout)[0]
+
+
+def parse_input(text, rules, timeout=RULE_TIMEOUT):
+    results = {"name": "", "machine": "", "location": "", "link": ""}
+    for rule in rules:
+        if rule.get('type') == 'extraction':
+            field = rule.get('value')
+            pattern = rule.get('pattern')
+            if field and pattern and not results.get(field):
+                try:
+                    match = guarded_search(pattern, text, re.IGNORECASE | re.MULTILINE, timeout)
+                    if match and len(match) > 1 and match[1] is not None:
+                        results[field] = match[1].strip().rstrip('.')
+                except re.error as e:
+                    print(f"Regex error in rule '{rule.get('name')}': {e}")
+                except RegexTimeout:
+                    print(f"Rule '{rule.get('name')}' timed out and was skipped.")
+    links = re.findall(r"https?://\S+", text)
+    if not results['link'] and links:
+        results['link'] = links[0]
+    return results
+
+
+def missing_fields(data):
+    return [field for field in FIELDS if not data.get(field)]
+
+
+def select_template(templates, language):
+    if language in templates and templates[language]:
+        return random.choice(templates[language])
+    return "Template not found."
+
+
+def render_template(template, data):
+    return template.format(
+        client_name=data["name"],
+        machine_name=data["machine"],
+        location=data["location"],
+        link=data["link"]
+    )
+
+
+def load_json_file(path, default, warnings=None):
+    """
+    Loads a JSON file, writing 'default' to it when it is missing. A file
+    that cannot be parsed (e.g. after a hand edit) is left untouched; a copy
+    of 'default' is used instead and the error is added to 'warnings'.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        save_json_file(path, default)
+    except ValueError as e:  # JSONDecodeError and UnicodeDecodeError
+        message = f"Could not read {path} ({e}); using the built-in defaults until it is fixed."
+        print(f"[LeadProcessor] {message}")
+        if warnings is not None:
+            warnings.append(message)
+    return json.loads(json.dumps(default))
+
+
+def save_json_file(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class LeadProcessor:
+    """Parsing rules + templates, and the operations LeadsTab needs on them."""
+
+    def __init__(self, rules_file=RULES_FILE, templates_file=TEMPLATES_FILE, timeout=RULE_TIMEOUT):
+        self.rules_file = rules_file
+        self.templates_file = templates_file
+        self.timeout = timeout
+        self.warnings = []  # unreadable rules/templates files, for the UI to report
+        self.load_rules()
+        self.load_templates()
+
+    def load_rules(self):
+        self.rules = load_json_file(self.rules_file, DEFAULT_RULES, self.warnings)
+
+    def load_templates(self):
+        self.templates = load_json_file(self.templates_file, DEFAULT_TEMPLATES, self.warnings)
+
+    def detect_language(self, text):
+        return self.detect_language_scored(text)[0]
+
+    def detect_language_scored(self, text):
+        return detect_language_scored(text, self.rules, self.timeout)
+
+    def parse_input(self, text):
+        return parse_input(text, self.rules, self.timeout)
+
+    def select_template(self, language):
+        return select_template(self.templates, language)
+
+    def build_message(self, data, language):
+        return render_template(self.select_template(language), data)
+
+    def process(self, text):
+        """Full pipeline for one message. 'message' is None while fields are missing."""
+        language, confidence = self.detect_language_scored(text)
+        data = self.parse_input(text)
+        missing = missing_fields(data)
+        return {
+            "language": language,
+            "confidence": confidence,
+            "data": data,
+            "missing": missing,
+            "message": None if missing else self.build_message(data, language),
+        }
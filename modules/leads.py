@@ -1,16 +1,16 @@
-import json
 import os
-import random
-import re
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QTextEdit, QMessageBox, QDialog, QDialogButtonBox, 
-                             QFormLayout, QLineEdit)
+                             QFormLayout, QLineEdit, QFileDialog, QInputDialog,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QColor
 import pyperclip
 
-# Correctly import the class from the 'bots' folder
-from bots.leads_bot import AutomationStepper
-import pyautogui
+from .lead_core import LeadProcessor, missing_fields
+from .lead_batch import load_and_parse
+from .worker import start_worker, stop_thread
+from .event_recorder import record_event, TEMPLATE_LEADS
 
 class PasteDetectTextEdit(QTextEdit):
     pasted = pyqtSignal()
@@ -61,6 +61,132 @@ class CorrectionDialog(QDialog):
             "link": self.link_input.text()
         }
 
+class BatchReviewDialog(QDialog):
+    """
+    Review queue for a batch of parsed enquiries. Complete rows already carry
+    their generated template; only rows with missing fields need a correction.
+    """
+    COLUMNS = ["Source", "Lang", "Client Name", "Machine", "Location", "Link", "Status"]
+
+    def __init__(self, results, leads_tab, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Batch Review ({len(results)} messages)")
+        self.setMinimumSize(1000, 600)
+        self.results = results
+        self.leads_tab = leads_tab
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(len(results), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(lambda row, _: self.review_row(row))
+        self.table.currentCellChanged.connect(lambda row, *_: self.show_preview(row))
+        layout.addWidget(self.table, 3)
+
+        self.preview = QTextEdit()
+        self.preview.setReadOnly(True)
+        layout.addWidget(self.preview, 1)
+
+        button_layout = QHBoxLayout()
+        next_incomplete_btn = QPushButton("Review Next Incomplete")
+        next_incomplete_btn.clicked.connect(self.review_next_incomplete)
+        copy_btn = QPushButton("Copy Template")
+        copy_btn.clicked.connect(self.copy_selected)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(next_incomplete_btn)
+        button_layout.addWidget(copy_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        for row, result in enumerate(self.results):
+            if not result["missing"]:
+                result["message"] = self.leads_tab.build_message(result["data"], result["language"])
+                result["status"] = "Ready"
+            else:
+                result["status"] = "Needs review"
+            self.populate_row(row)
+        self.update_summary()
+        if self.results:
+            self.table.selectRow(0)
+
+    def populate_row(self, row):
+        result = self.results[row]
+        data = result["data"]
+        language = f"{result['language']} ({result['confidence']:.0%})"
+        values = [result["source"], language, data["name"], data["machine"],
+                  data["location"], data["link"], result["status"]]
+        colors = {"Ready": "#d4edda", "Needs review": "#fff3cd", "Copied": "#e2e3e5"}
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            item.setBackground(QColor(colors.get(result["status"], "#ffffff")))
+            item.setForeground(QColor("black"))
+            if col == 0 and result["subject"]:
+                item.setToolTip(result["subject"])
+            self.table.setItem(row, col, item)
+
+    def update_summary(self):
+        pending = sum(1 for r in self.results if r["status"] == "Needs review")
+        copied = sum(1 for r in self.results if r["status"] == "Copied")
+        self.summary_label.setText(
+            f"Messages: {len(self.results)} | Need review: {pending} | Copied: {copied}")
+
+    def show_preview(self, row):
+        if 0 <= row < len(self.results):
+            result = self.results[row]
+            self.preview.setPlainText(result.get("message") or result["text"])
+
+    def review_row(self, row):
+        result = self.results[row]
+        if result["status"] != "Needs review":
+            return
+        dialog = CorrectionDialog(result["data"], self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        data = dialog.get_corrected_data()
+        result["data"] = data
+        result["missing"] = missing_fields(data)
+        if result["missing"]:
+            QMessageBox.warning(self, "Incomplete Information", "All fields must be filled out.")
+        else:
+            result["message"] = self.leads_tab.build_message(data, result["language"])
+            result["status"] = "Ready"
+        self.populate_row(row)
+        self.update_summary()
+        self.show_preview(row)
+
+    def review_next_incomplete(self):
+        for row, result in enumerate(self.results):
+            if result["status"] == "Needs review":
+                self.table.selectRow(row)
+                self.review_row(row)
+                return
+        QMessageBox.information(self, "Batch Review", "No incomplete messages left.")
+
+    def copy_selected(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        result = self.results[row]
+        if result["status"] == "Needs review":
+            self.review_row(row)
+            return
+        self.leads_tab.copy_message(result["message"])
+        result["status"] = "Copied"
+        self.populate_row(row)
+        self.update_summary()
+        # Jump to the next row that is ready to be copied
+        for next_row in range(row + 1, len(self.results)):
+            if self.results[next_row]["status"] == "Ready":
+                self.table.selectRow(next_row)
+                break
+
 class LeadsTab(QWidget):
     output_message = pyqtSignal(str)
 
@@ -68,14 +194,20 @@ class LeadsTab(QWidget):
         super().__init__(parent)
         self.main_window = main_window
         self.bot_window = None # To hold a reference to the bot window
+        self.batch_thread = None
+        self.batch_worker = None
         self.used_templates = []
-        self.templates_file = "templates/leads_templates.json"
-        self.rules_file = "regex/parsing_rules.json"
+        self.processor = LeadProcessor()
         self.template_counter = 0
-        self.load_templates()
-        self.load_rules()
         self.init_ui()
         self.update_counter_display()
+        # output_message is connected once the tab is built, so report on the next loop turn
+        QTimer.singleShot(0, self.report_processor_warnings)
+
+    def report_processor_warnings(self):
+        for warning in self.processor.warnings:
+            self.output_message.emit(f"[Leads Tab] {warning}\n")
+        self.processor.warnings.clear()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -110,10 +242,14 @@ class LeadsTab(QWidget):
         generate_button = QPushButton("Generate Template")
         generate_button.clicked.connect(self.process_text)
 
+        self.batch_button = QPushButton("Batch From Mailbox")
+        self.batch_button.clicked.connect(self.start_batch)
+
         launch_bot_button = QPushButton("Launch Leads Bot")
         launch_bot_button.clicked.connect(self.launch_leads_bot)
 
         button_layout.addWidget(generate_button)
+        button_layout.addWidget(self.batch_button)
         button_layout.addWidget(launch_bot_button)
 
         main_layout.addLayout(button_layout)
@@ -122,6 +258,10 @@ class LeadsTab(QWidget):
 
     def launch_leads_bot(self):
         """Creates and shows the AutomationStepper window after a warning."""
+        # pyautogui probes the display on import, so the bot is only loaded when launched
+        import pyautogui
+        from bots.leads_bot import AutomationStepper
+
         # If the bot window already exists, just show it and bring it to the front
         if self.bot_window and self.bot_window.isVisible():
             self.bot_window.activateWindow()
@@ -174,37 +314,22 @@ class LeadsTab(QWidget):
         self.output_message.emit(f"[Leads Tab] {message.splitlines()[0]}...\n")
 
     def detect_language(self, text):
-        text_lower = text.lower()
-        for rule in self.rules:
-            if rule.get('type') == 'language_detect':
-                if re.search(rule.get('pattern', ''), text_lower, re.IGNORECASE):
-                    return rule.get('value')
-        return "en"
+        return self.detect_language_scored(text)[0]
+
+    def detect_language_scored(self, text):
+        """Returns (language, confidence) for the text."""
+        return self.processor.detect_language_scored(text)
 
     def parse_input(self, text):
-        results = {"name": "", "machine": "", "location": "", "link": ""}
-        for rule in self.rules:
-            if rule.get('type') == 'extraction':
-                field = rule.get('value')
-                pattern = rule.get('pattern')
-                if field and pattern and not results.get(field):
-                    try:
-                        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                        if match and match.groups():
-                            results[field] = match.group(1).strip().rstrip('.')
-                    except re.error as e:
-                        print(f"Regex error in rule '{rule.get('name')}': {e}")
-        links = re.findall(r"https?://\S+", text)
-        if not results['link'] and links:
-            results['link'] = links[0]
-        return results
+        return self.processor.parse_input(text)
 
     def process_text(self):
         text = self.textbox.toPlainText().strip()
         if not text:
             self.update_status("Please paste some text first.", color="orange")
             return
-        lang = self.detect_language(text)
+        lang, confidence = self.detect_language_scored(text)
+        self.output_message.emit(f"[Leads Tab] Detected language '{lang}' (confidence {confidence:.0%})\n")
         parsed_data = self.parse_input(text)
         if not all(parsed_data.values()):
             dialog = CorrectionDialog(parsed_data, self)
@@ -219,46 +344,84 @@ class LeadsTab(QWidget):
         else:
             self.generate_and_copy(parsed_data, lang)
 
+    def build_message(self, data, lang):
+        return self.processor.build_message(data, lang)
+
     def generate_and_copy(self, data, lang):
-        template = self.select_template(lang)
-        final_message = template.format(
-            client_name=data["name"],
-            machine_name=data["machine"],
-            location=data["location"],
-            link=data["link"]
-        )
+        final_message = self.build_message(data, lang)
         pyperclip.copy(final_message)
+        record_event(TEMPLATE_LEADS)
         self.textbox.clear()
         self.template_counter += 1
         self.update_counter_display()
         self.update_status("Template generated and copied to clipboard!", color="green")
 
+    def copy_message(self, message):
+        """Copies an already generated template (used by the batch review queue)."""
+        pyperclip.copy(message)
+        record_event(TEMPLATE_LEADS)
+        self.template_counter += 1
+        self.update_counter_display()
+        self.update_status("Batch template copied to clipboard!", color="green")
+
+    def start_batch(self):
+        """Asks for an mbox file or a folder of .eml files and parses it in the background."""
+        if self.batch_thread and self.batch_thread.isRunning():
+            self.update_status("A batch is already being processed.", color="orange")
+            return
+        source_type, ok = QInputDialog.getItem(self, "Batch Source", "Read messages from:",
+                                               ["Mbox file", "Folder of .eml files"], 0, False)
+        if not ok:
+            return
+        if source_type == "Mbox file":
+            path, _ = QFileDialog.getOpenFileName(self, "Select Mbox File", "", "Mailbox (*.mbox *.mbx);;All files (*)")
+        else:
+            path = QFileDialog.getExistingDirectory(self, "Select Folder with .eml Files")
+        if not path:
+            return
+
+        self.batch_button.setEnabled(False)
+        self.update_status(f"Parsing messages from {os.path.basename(path)}...", color="blue")
+
+        self.batch_thread, self.batch_worker = start_worker(
+            load_and_parse, path, self.processor.rules,
+            on_finished=self.on_batch_finished, on_error=self.on_batch_error)
+
+    def on_batch_finished(self, results):
+        self.batch_button.setEnabled(True)
+        if not results:
+            self.update_status("No messages found in the selected source.", color="orange")
+            return
+        incomplete = sum(1 for r in results if r["missing"])
+        self.update_status(f"Parsed {len(results)} messages ({incomplete} need review).", color="green")
+        BatchReviewDialog(results, self, self).exec_()
+
+    def on_batch_error(self, message):
+        self.batch_button.setEnabled(True)
+        self.update_status(f"Batch parsing failed: {message}", color="red")
+
+    def reset_process(self):
+        """Waits for a running batch so the thread is not destroyed while still running."""
+        stop_thread(self.batch_thread)
+
     def select_template(self, language):
-        if language in self.templates and self.templates[language]:
-            return random.choice(self.templates[language])
-        return "Template not found."
+        return self.processor.select_template(language)
+
+    @property
+    def rules(self):
+        return self.processor.rules
+
+    @property
+    def templates(self):
+        return self.processor.templates
 
     def load_rules(self):
-        try:
-            with open(self.rules_file, 'r', encoding='utf-8') as f:
-                self.rules = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.rules = [
-                {"name": "Detect Language: French", "type": "language_detect", "value": "fr", "pattern": "bonjour|votre intérêt|localisation"},
-                {"name": "Detect Language: Italian", "type": "language_detect", "value": "it", "pattern": "buongiorno|gentile|località|interesse per"},
-                {"name": "Extract: Client Name", "type": "extraction", "value": "name", "pattern": "(?:Dear|Hello|Bonjour|Cher|Gentile|Ciao)\\s+([\\w\\s.'-]+?)\\s*,"},
-                {"name": "Extract: Machine Name", "type": "extraction", "value": "machine", "pattern": "(?:interest in our machine|machine|votre intérêt pour notre machine|interesse per (?:la|la nostra) macchina)\\s*:\\s*([^\\r\\n]*)"},
-                {"name": "Extract: Location", "type": "extraction", "value": "location", "pattern": "(?:Location|Localisation|Località)\\s*:\\s*([^\\r\\n]*)"}
-            ]
-            self.save_rules()
-            
+        self.processor.load_rules()
+        self.report_processor_warnings()
+
     def load_templates(self):
-        try:
-            with open(self.templates_file, 'r', encoding='utf-8') as f:
-                self.templates = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.templates = {"en": ["Hello {client_name}, ..."], "it": [], "fr": []}
-            self.save_templates()
+        self.processor.load_templates()
+        self.report_processor_warnings()
 
     def update_counter_display(self):
         """Updates the text of the counter label in the UI."""
@@ -0,0 +1,111 @@
+# modules/log_crypto.py
+
+"""
+Encryption helpers for the temporal log.
+
+Deriving a key is deliberately slow (100,000 PBKDF2-SHA256 iterations), so
+the key for each password is derived once per session and kept in a
+KeyCache for a limited time. decrypt_tokens derives or reuses the key and
+decrypts entries in batches. It is a generator meant to run in a Worker
+thread, so results appear in the view while it works.
+
+cryptography is imported on first use, so opening the log tab does not
+pay for it until something is encrypted or decrypted.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+# Use a securely generated salt in a real application
+SALT = b'gindumac_static_salt_'
+ITERATIONS = 100000
+KEY_TTL = 15 * 60  # seconds a derived key stays cached after its last use
+DECRYPT_BATCH = 50
+
+
+def derive_key(password):
+    if not password:
+        return None
+    from cryptography.fernet import Fernet
+    key = hashlib.pbkdf2_hmac('sha256', password.encode(), SALT, ITERATIONS, dklen=32)
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class KeyCache:
+    """
+    Derived keys of this session, looked up by an HMAC of the password under
+    a random per-session secret (the password itself is never stored).
+    Thread-safe; entries expire 'ttl' seconds after their last use.
+    """
+
+    def __init__(self, ttl=KEY_TTL):
+        self.ttl = ttl
+        self.secret = os.urandom(32)
+        self.keys = {}  # lookup -> (Fernet, expiry)
+        self.lock = threading.Lock()
+
+    def _lookup(self, password):
+        return hmac.new(self.secret, password.encode(), hashlib.sha256).digest()
+
+    def get(self, password):
+        """The cached key for this password, or None."""
+        lookup = self._lookup(password)
+        now = time.monotonic()
+        with self.lock:
+            cached = self.keys.get(lookup)
+            if cached is None or cached[1] < now:
+                self.keys.pop(lookup, None)
+                return None
+            self.keys[lookup] = (cached[0], now + self.ttl)
+            return cached[0]
+
+    def put(self, password, fernet):
+        with self.lock:
+            self.keys[self._lookup(password)] = (fernet, time.monotonic() + self.ttl)
+
+    def get_or_derive(self, password):
+        """Cached key, or a freshly derived one (not cached until it is known to work)."""
+        return self.get(password) or derive_key(password)
+
+    def purge(self):
+        """Drops the expired keys."""
+        now = time.monotonic()
+        with self.lock:
+            for lookup in [k for k, (_, expiry) in self.keys.items() if expiry < now]:
+                del self.keys[lookup]
+
+    def clear(self):
+        with self.lock:
+            self.keys.clear()
+
+
+def decrypt_tokens(key_cache, password, tokens, batch_size=DECRYPT_BATCH):
+    """
+    Decrypts a list of (key, Fernet token) pairs with one password.
+    Generator for Worker: yields (done, total, [(key, text or None)])
+    per batch and returns (decrypted, failed). The key is cached as soon
+    as it opens one token.
+    """
+    from cryptography.fernet import InvalidToken
+    fernet = key_cache.get_or_derive(password)
+    cached = False
+    decrypted = failed = 0
+    for start in range(0, len(tokens), batch_size):
+        results = []
+        for key, token in tokens[start:start + batch_size]:
+            try:
+                text = fernet.decrypt(token.encode()).decode()
+                decrypted += 1
+                if not cached:
+                    key_cache.put(password, fernet)
+                    cached = True
+            except (InvalidToken, ValueError):
+                text = None
+                failed += 1
+            results.append((key, text))
+        yield (start + len(results), len(tokens), results)
+    return decrypted, failed
@@ -0,0 +1,235 @@
+# modules/log_index.py
+
+"""
+Full-text search over the temporal log.
+
+Plaintext entries go into an inverted index (term -> entries) stored in
+SQLite next to the log. An entry is identified by its entry number in the
+LogStore. The index remembers how many entries it has covered: save_log
+adds each new entry directly, and anything else is caught up from that
+point, so the log is never re-read as a whole. When the store renumbers its
+entries (cleared or compacted), its generation changes and the index is
+rebuilt. Decrypted entries are only indexed in memory and are forgotten
+when the app closes.
+
+Every query word matches whole words and words starting with it. An entry
+must match all the words. Results are ranked by TF-IDF, with whole-word
+matches counting double, and ties go to the newest entry.
+"""
+
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+
+INDEX_FILE = Path("other/temporal_log.idx")
+
+TOKEN_RE = re.compile(r"\w+")
+MIN_PREFIX = 2        # shorter query words only match whole words
+PREFIX_WEIGHT = 0.5   # a prefix match counts half as much as a whole word
+RESULT_LIMIT = 200
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with 'prefix'."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class MemoryIndex:
+    """Session-only postings for decrypted entries (never written to disk)."""
+
+    def __init__(self):
+        self.postings = {}  # term -> {number: tf}
+        self.terms = []     # sorted, for prefix lookups
+        self.entries = set()
+
+    def add(self, number, text):
+        if number in self.entries:
+            return
+        self.entries.add(number)
+        for term, tf in Counter(tokenize(text)).items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                self.terms.insert(bisect_left(self.terms, term), term)
+            self.postings[term][number] = tf
+
+    def expand(self, word):
+        """{term: df} of the terms matching a query word."""
+        if len(word) < MIN_PREFIX:
+            return {word: len(self.postings[word])} if word in self.postings else {}
+        matches = {}
+        for i in range(bisect_left(self.terms, word), len(self.terms)):
+            if not self.terms[i].startswith(word):
+                break
+            matches[self.terms[i]] = len(self.postings[self.terms[i]])
+        return matches
+
+    def clear(self):
+        self.__init__()
+
+
+class LogIndex:
+    def __init__(self, store, index_path=INDEX_FILE):
+        self.store = store
+        self.index_path = Path(index_path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-16384")  # 16 MB; the first build of a big log inserts millions of postings
+        with self.lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    term  TEXT NOT NULL,
+                    entry INTEGER NOT NULL,
+                    tf    INTEGER NOT NULL,
+                    PRIMARY KEY (term, entry)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.memory = MemoryIndex()
+        self.cancelled = False
+
+    # --- indexing ---
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _add(self, batch):
+        """Indexes [(number, text)] (caller holds the transaction)."""
+        postings = []
+        df = Counter()
+        for number, text in batch:
+            for term, tf in Counter(tokenize(text)).items():
+                postings.append((term, number, tf))
+                df[term] += 1
+        postings.sort()  # in key order: B-tree appends instead of random inserts
+        self.conn.executemany("INSERT OR REPLACE INTO postings (term, entry, tf) VALUES (?, ?, ?)", postings)
+        self.conn.executemany("""
+            INSERT INTO terms (term, df) VALUES (?, ?)
+            ON CONFLICT (term) DO UPDATE SET df = df + excluded.df
+        """, df.items())
+        self._set_meta("entries", self._meta("entries") + len(batch))
+
+    def add_entry(self, number, text):
+        """
+        Indexes an entry just appended to the store (text None for an
+        encrypted one). Ignored if the index is not caught up to 'number'
+        yet; catch_up reads it from the store then.
+        """
+        with self.lock, self.conn:
+            if self._meta("indexed") != number or self._meta("generation") != self.store.generation:
+                return
+            if text is not None:
+                self._add([(number, text)])
+            self._set_meta("indexed", number + 1)
+
+    def catch_up(self, batch_size=20000):
+        """Indexes the entries the store gained since the last run (all of them after a renumbering). Returns the entry count added."""
+        with self.lock:
+            start = self._meta("indexed")
+            generation = self._meta("generation")
+        if generation != self.store.generation:
+            self.clear()
+            start = 0
+        added = 0
+        for end, entries in self.store.iter_entries(start, batch_size):
+            batch = [(number, message) for number, _, encrypted, message in entries if not encrypted]
+            with self.lock, self.conn:
+                if self._meta("indexed") != start:
+                    return added  # another writer moved the index on; stop here
+                self._add(batch)
+                self._set_meta("indexed", end)
+            added += len(batch)
+            if self.cancelled:
+                return added
+            start = end
+        return added
+
+    def cancel(self):
+        """Makes a running catch_up stop after its current batch (the rest is indexed next time)."""
+        self.cancelled = True
+
+    def add_decrypted(self, number, text):
+        """Session-only indexing of a decrypted entry."""
+        self.memory.add(number, text)
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM postings")
+            self.conn.execute("DELETE FROM terms")
+            self.conn.execute("DELETE FROM meta")
+            self._set_meta("generation", self.store.generation)
+        self.memory.clear()
+
+    # --- queries ---
+
+    def _expand(self, word):
+        if len(word) < MIN_PREFIX:
+            rows = self.conn.execute("SELECT term, df FROM terms WHERE term = ?", (word,))
+        else:
+            rows = self.conn.execute("SELECT term, df FROM terms WHERE term >= ? AND term < ?",
+                                     (word, prefix_upper_bound(word)))
+        return dict(rows.fetchall())
+
+    def search(self, query, limit=RESULT_LIMIT):
+        """Entry numbers matching every word of the query, best first."""
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        with self.lock:
+            total = self._meta("entries") + len(self.memory.entries)
+            expansions = [(word, self._expand(word), self.memory.expand(word)) for word in words]
+            # Rarest word first, so the candidate set starts small
+            expansions.sort(key=lambda e: sum(e[1].values()) + sum(e[2].values()))
+            scores = None
+            for word, disk_terms, memory_terms in expansions:
+                word_scores = {}
+                for terms, postings_for in ((disk_terms, self._disk_postings), (memory_terms, self._memory_postings)):
+                    for term, df in terms.items():
+                        weight = math.log(1 + total / df) * (1.0 if term == word else PREFIX_WEIGHT)
+                        rows = postings_for(term, scores)
+                        if not word_scores:
+                            word_scores = {number: weight if tf == 1 else (1 + math.log(tf)) * weight
+                                           for number, tf in rows}
+                            continue
+                        for number, tf in rows:
+                            score = weight if tf == 1 else (1 + math.log(tf)) * weight
+                            if score > word_scores.get(number, 0.0):
+                                word_scores[number] = score
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {number: scores[number] + score for number, score in word_scores.items() if number in scores}
+                if not scores:
+                    return []
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [number for number, _ in best]
+
+    def _disk_postings(self, term, candidates):
+        if candidates is not None and len(candidates) < 500:
+            marks = ",".join("?" * len(candidates))
+            return self.conn.execute(
+                f"SELECT entry, tf FROM postings WHERE term = ? AND entry IN ({marks})",
+                (term, *candidates)).fetchall()
+        return self.conn.execute("SELECT entry, tf FROM postings WHERE term = ?", (term,)).fetchall()
+
+    def _memory_postings(self, term, candidates):
+        return self.memory.postings.get(term, {}).items()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,425 @@
+# modules/log_store.py
+
+"""
+Append-only storage for the temporal log.
+
+Entries are framed binary records, so a message may contain anything
+(newlines, '|||', ...):
+
+    uint32 payload length | uint32 crc32(payload) | payload
+    payload = uint8 flags | uint16 timestamp length | timestamp | message   (UTF-8)
+
+Records go into numbered segment files (temporal_log.000001.log, ...). A new
+segment starts once the current one passes MAX_SEGMENT_BYTES. Next to each
+segment, a .off file holds the uint64 start offset of every record. Entry
+number n can therefore be read with one seek, and TailReader pages
+backwards through the log without scanning it.
+
+The manifest (temporal_log.manifest) names the segment set in use and its
+generation. 'compact' writes all valid records into a new set
+(temporal_log.c<generation>.000001.log, ...) and switches to it with one
+atomic rename of the manifest, so a crash leaves either the old or the new
+set in use; the other one is deleted on the next open. Run it while the
+app is closed:
+
+    python -m modules.log_store compact
+
+The old text log (other/temporal_log.txt) is migrated on first open and
+kept as temporal_log.txt.migrated.
+"""
+
+import argparse
+import array
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+
+LOG_BASE = Path("other/temporal_log")
+LEGACY_TEXT_LOG = Path("other/temporal_log.txt")
+
+MAGIC = b"TLOG\x01\x00\x00\x00"  # segment header: format name + version
+FRAME = struct.Struct("<II")       # payload length, crc32
+FIELDS = struct.Struct("<BH")      # flags, timestamp length
+OFFSET = struct.Struct("<Q")
+FLAG_ENCRYPTED = 1
+MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+PAGE_SIZE = 200
+
+
+def parse_line(line):
+    """Legacy text format: 'timestamp|||ENC|||message' -> (timestamp, encrypted, message), or None if malformed."""
+    parts = line.strip().split("|||", 2)
+    if len(parts) != 3:
+        return None
+    timestamp, flag, message = parts
+    return timestamp, flag == "ENC", message
+
+
+def encode_record(timestamp, encrypted, message):
+    timestamp = timestamp.encode("utf-8")
+    payload = FIELDS.pack(FLAG_ENCRYPTED if encrypted else 0, len(timestamp)) + timestamp + message.encode("utf-8")
+    return FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_record(buffer, offset):
+    """(timestamp, encrypted, message, end) of the frame at 'offset', or None if torn or corrupted."""
+    if offset + FRAME.size > len(buffer):
+        return None
+    length, crc = FRAME.unpack_from(buffer, offset)
+    start = offset + FRAME.size
+    payload = bytes(buffer[start:start + length])
+    if len(payload) != length or length < FIELDS.size or zlib.crc32(payload) != crc:
+        return None
+    flags, ts_length = FIELDS.unpack_from(payload)
+    timestamp = payload[FIELDS.size:FIELDS.size + ts_length].decode("utf-8", errors="replace")
+    message = payload[FIELDS.size + ts_length:].decode("utf-8", errors="replace")
+    return timestamp, bool(flags & FLAG_ENCRYPTED), message, start + length
+
+
+class Segment:
+    def __init__(self, path, first):
+        self.path = Path(path)
+        self.offsets_path = self.path.with_suffix(".off")
+        self.first = first  # entry number of the first record
+        self.count = self.offsets_path.stat().st_size // OFFSET.size if self.offsets_path.exists() else 0
+
+    def size(self):
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def offsets(self, start, end):
+        """Record offsets for local record numbers [start, end)."""
+        values = array.array("Q")
+        with open(self.offsets_path, "rb") as f:
+            f.seek(start * OFFSET.size)
+            values.frombytes(f.read((end - start) * OFFSET.size))
+        if sys.byteorder == "big":
+            values.byteswap()  # stored little-endian
+        return values
+
+    def recover(self):
+        """
+        Makes the offsets file agree with the records after a crash: frames
+        written without their offset are added, and a torn last frame is cut off.
+        """
+        if not self.path.exists():
+            return
+        end = len(MAGIC)
+        if self.count:
+            last = self.offsets(self.count - 1, self.count)[0]
+            with open(self.path, "rb") as f:
+                f.seek(last)
+                header = f.read(FRAME.size)
+            if len(header) == FRAME.size:
+                end = last + FRAME.size + FRAME.unpack(header)[0]
+        size = self.size()
+        if size == end:
+            return
+        if size < end:
+            # The last offset points past the data: drop it
+            self.count -= 1
+            with open(self.offsets_path, "r+b") as f:
+                f.truncate(self.count * OFFSET.size)
+            return self.recover()
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            found = []
+            while end < size:
+                record = decode_record(data, end)
+                if record is None:
+                    break
+                found.append(end)
+                end = record[3]
+            f.truncate(end)
+        with open(self.offsets_path, "ab") as f:
+            f.write(b"".join(OFFSET.pack(offset) for offset in found))
+        self.count += len(found)
+
+
+class LogStore:
+    def __init__(self, base=LOG_BASE, legacy_text=LEGACY_TEXT_LOG, max_segment_bytes=MAX_SEGMENT_BYTES):
+        self.base = Path(base)
+        self.base.parent.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.lock = threading.Lock()
+        self.manifest_path = self.base.with_name(self.base.name + ".manifest")
+        # '<base>.000001.log' or '<base>.c<generation>.000001.log' (and .off)
+        self.set_pattern = re.compile(rf"^({re.escape(self.base.name)}(?:\.c\d+)?)\.\d+\.(?:log|off)$")
+        self.load_segments()
+        if legacy_text and Path(legacy_text).exists() and not self.count():
+            self.migrate_text(Path(legacy_text))
+
+    # --- segments ---
+
+    def segment_path(self, number):
+        return self.base.with_name(f"{self.segment_set}.{number:06d}.log")
+
+    def segment_sets(self):
+        """{set name: [its .log and .off files]} of every segment set next to the log."""
+        sets = {}
+        for path in self.base.parent.glob(f"{self.base.name}.*"):
+            match = self.set_pattern.match(path.name)
+            if match:
+                sets.setdefault(match.group(1), []).append(path)
+        return sets
+
+    def load_segments(self):
+        self.read_manifest()
+        self.segments = []
+        first = 0
+        for path in sorted(self.base.parent.glob(f"{self.segment_set}.[0-9]*.log")):
+            segment = Segment(path, first)
+            segment.recover()
+            self.segments.append(segment)
+            first += segment.count
+
+    def read_manifest(self):
+        """
+        Sets 'generation' and 'segment_set' from the manifest. The generation
+        changes whenever entry numbers are reassigned (clear, compact), so
+        indexes know to rebuild. Sets the manifest does not name are left
+        over from an interrupted compaction and are deleted.
+        """
+        sets = self.segment_sets()
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.generation = manifest["generation"]
+            self.segment_set = manifest.get("segments", self.base.name)  # older manifests had no set
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # No usable manifest: use the original set, else the newest compacted one
+            compacted = [name for name in sets if name != self.base.name]
+            if self.base.name in sets or not compacted:
+                self.segment_set = self.base.name
+            else:
+                self.segment_set = max(compacted, key=lambda name: int(name.rsplit(".c", 1)[1]))
+            self.new_generation()
+            return
+        for name, paths in sets.items():
+            if name != self.segment_set:
+                for path in paths:
+                    path.unlink(missing_ok=True)
+        for path in self.base.parent.glob(f"{self.base.name}.c*.manifest"):
+            path.unlink(missing_ok=True)  # written by the compaction's own store
+
+    def new_generation(self):
+        self.write_manifest(time.time_ns(), self.segment_set)
+        return self.generation
+
+    def write_manifest(self, generation, segment_set):
+        """Replaces the manifest in one rename, so it always names a complete set."""
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation, "segments": segment_set}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        self.generation = generation
+        self.segment_set = segment_set
+
+    def _writable_segment(self, incoming):
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or (segment.count and segment.size() + incoming > self.max_segment_bytes):
+            number = int(segment.path.name.split(".")[-2]) + 1 if segment else 1
+            first = segment.first + segment.count if segment else 0
+            path = self.segment_path(number)
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+            Path(path).with_suffix(".off").write_bytes(b"")  # an orphan offsets file may be left by a crash
+            segment = Segment(path, first)
+            self.segments.append(segment)
+        return segment
+
+    # --- writing ---
+
+    def append(self, timestamp, encrypted, message):
+        """Appends one entry and returns its entry number."""
+        return self.append_many([(timestamp, encrypted, message)])
+
+    def append_many(self, entries):
+        """Appends entries (timestamp, encrypted, message); returns the entry number of the first one."""
+        with self.lock:
+            first_number = None
+            records = [encode_record(*entry) for entry in entries]
+            i = 0
+            while i < len(records):
+                segment = self._writable_segment(len(records[i]))
+                position = segment.size()
+                start = i
+                offsets = []
+                while i < len(records):
+                    if offsets and position + len(records[i]) > self.max_segment_bytes:
+                        break  # the rest goes to a new segment
+                    offsets.append(OFFSET.pack(position))
+                    position += len(records[i])
+                    i += 1
+                # Data first, then offsets: a crash in between is repaired by Segment.recover
+                with open(segment.path, "ab") as f:
+                    f.write(b"".join(records[start:i]))
+                with open(segment.offsets_path, "ab") as f:
+                    f.write(b"".join(offsets))
+                if first_number is None:
+                    first_number = segment.first + segment.count
+                segment.count += i - start
+            return first_number
+
+    # --- reading ---
+
+    def count(self):
+        with self.lock:
+            return self.segments[-1].first + self.segments[-1].count if self.segments else 0
+
+    def read(self, number):
+        """(number, timestamp, encrypted, message) of one entry, or None."""
+        entries = self.read_range(number, number + 1)
+        return entries[0] if entries else None
+
+    def read_range(self, start, end):
+        """Entries [start, end) as (number, timestamp, encrypted, message); corrupted ones are skipped."""
+        with self.lock:
+            segments = list(self.segments)
+        firsts = [segment.first for segment in segments]
+        entries = []
+        number = max(start, 0)
+        while number < end and segments:
+            segment = segments[bisect_right(firsts, number) - 1]
+            local_end = min(end - segment.first, segment.count)
+            if number - segment.first >= local_end:
+                break
+            offsets = segment.offsets(number - segment.first, local_end)
+            try:
+                with open(segment.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for i, offset in enumerate(offsets):
+                        record = decode_record(mm, offset)
+                        if record is not None:
+                            entries.append((number + i,) + record[:3])
+            except (OSError, ValueError):
+                pass
+            number = segment.first + local_end
+        return entries
+
+    def iter_entries(self, start=0, batch_size=5000):
+        """Yields (end, entries) batches from 'start' to the current end; 'end' is the next unread entry number."""
+        while True:
+            end = min(start + batch_size, self.count())
+            if start >= end:
+                return
+            yield end, self.read_range(start, end)
+            start = end
+
+    # --- maintenance ---
+
+    def migrate_text(self, text_path):
+        """Imports the old 'timestamp|||FLAG|||message' log, then renames it to *.migrated."""
+        entries = []
+        with open(text_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                entry = parse_line(line)
+                if entry:
+                    entries.append(entry)
+        if entries:
+            self.append_many(entries)
+        text_path.replace(text_path.with_name(text_path.name + ".migrated"))
+
+    def clear(self):
+        """Deletes every segment."""
+        with self.lock:
+            for segment in self.segments:
+                for path in (segment.path, segment.offsets_path):
+                    if path.exists():
+                        path.unlink()
+            self.segments = []
+            self.new_generation()
+
+    def compact(self):
+        """
+        Rewrites all readable entries into a new segment set, dropping
+        corrupted frames, and switches the manifest to it. Entry numbers can
+        change, so the generation is renewed. Returns (kept, dropped).
+        """
+        total = self.count()
+        entries = [entry[1:] for _, batch in self.iter_entries() for entry in batch]
+        generation = time.time_ns()
+        segment_set = f"{self.base.name}.c{generation}"
+        compacted = LogStore(self.base.with_name(segment_set), legacy_text=None,
+                             max_segment_bytes=self.max_segment_bytes)
+        if entries:
+            compacted.append_many(entries)
+        # The new set must be on disk before the manifest points to it
+        for segment in compacted.segments:
+            for path in (segment.path, segment.offsets_path):
+                with open(path, "rb+") as f:
+                    os.fsync(f.fileno())
+        compacted.manifest_path.unlink()
+        with self.lock:
+            old = [path for segment in self.segments for path in (segment.path, segment.offsets_path)]
+            self.write_manifest(generation, segment_set)
+            for path in old:
+                path.unlink(missing_ok=True)
+        self.load_segments()
+        return len(entries), total - len(entries)
+
+
+class TailReader:
+    """
+    Pages through the log starting from the newest entry. Entries
+    [position, end) are the ones handed out; a caller that drops some of them
+    again moves 'position' or 'end' so they are read again when needed.
+    """
+
+    def __init__(self, store, page_size=PAGE_SIZE):
+        self.store = store
+        self.page_size = page_size
+        self.position = self.end = store.count()
+
+    @property
+    def has_more(self):
+        """Older entries remain before the window."""
+        return self.position > 0
+
+    @property
+    def has_newer(self):
+        """Newer entries remain after the window (dropped earlier, or appended since)."""
+        return self.end < self.store.count()
+
+    def read_page(self):
+        """Up to page_size (number, timestamp, encrypted, message) entries before 'position', oldest first."""
+        start = max(self.position - self.page_size, 0)
+        entries = self.store.read_range(start, self.position)
+        self.position = start
+        return entries
+
+    def read_newer_page(self):
+        """Up to page_size entries from 'end' on, oldest first."""
+        end = min(self.end + self.page_size, self.store.count())
+        entries = self.store.read_range(self.end, end)
+        self.end = end
+        return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temporal log maintenance (run it while the app is closed).")
+    parser.add_argument("--base", default=str(LOG_BASE), help="log base path (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("compact", help="rewrite the log into full segments, dropping corrupted entries")
+    commands.add_parser("stats", help="print entry and segment counts")
+    args = parser.parse_args(argv)
+
+    store = LogStore(args.base)
+    if args.command == "compact":
+        kept, dropped = store.compact()
+        print(f"Compacted: {kept} entries kept, {dropped} dropped, {len(store.segments)} segments")
+    else:
+        size = sum(segment.size() for segment in store.segments)
+        print(f"{store.count()} entries in {len(store.segments)} segments, {size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
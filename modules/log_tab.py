@@ -1,151 +1,283 @@
 # log_tab.py
-import os
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QCheckBox,
-    QLineEdit, QScrollArea, QMessageBox, QInputDialog
+    QLineEdit, QMessageBox, QInputDialog, QListView, QStyledItemDelegate,
+    QAbstractItemView, QAction, QApplication, QStyle
 )
-from PyQt5.QtCore import Qt, pyqtSlot
-from PyQt5.QtGui import QFont
-from cryptography.fernet import Fernet, InvalidToken
-from hashlib import pbkdf2_hmac
-import base64
+from PyQt5.QtCore import (
+    Qt, pyqtSlot, pyqtSignal, QAbstractListModel, QModelIndex, QEvent, QPoint, QRect, QSize, QTimer
+)
+from PyQt5.QtGui import QFont, QFontMetrics, QColor, QPainter, QPen, QCursor
 
-class LogEntryWidget(QWidget):
-    """
-    A widget representing a single log entry, which is theme-aware and can
-    update its appearance when the application theme changes.
-    """
-    def __init__(self, timestamp, message, encrypted, key_callback, is_dark=False):
-        super().__init__()
+from .log_store import LogStore, TailReader
+from .log_index import LogIndex, RESULT_LIMIT
+from .log_crypto import KeyCache, derive_key, decrypt_tokens
+from .worker import start_worker, stop_thread
+
+# Rows kept in the log view while paging through the history
+MAX_LOADED_ROWS = 2000
+
+
+def decrypt_store(key_cache, password, store):
+    """decrypt_tokens over every encrypted entry of the store, keyed by entry number (runs in the worker)."""
+    tokens = [(number, message)
+              for _, entries in store.iter_entries()
+              for number, _, encrypted, message in entries if encrypted]
+    return (yield from decrypt_tokens(key_cache, password, tokens))
+
+class LogEntry:
+    """One line of the temporal log. 'decrypted' holds the plain text once an encrypted entry is unlocked."""
+    __slots__ = ("number", "timestamp", "message", "encrypted", "decrypted", "size_cache")
+
+    def __init__(self, number, timestamp, message, encrypted):
+        self.number = number  # entry number in the LogStore; identifies the entry
         self.timestamp = timestamp
+        self.message = message
         self.encrypted = encrypted
-        self.key_callback = key_callback
-        self.is_dark = is_dark
-        self.encrypted_message = message if encrypted else None
-        self.plain_message = message if not encrypted else None
+        self.decrypted = None
+        self.size_cache = None  # (width, locked, height) of the last size hint
 
-        self.init_ui()
+    @property
+    def locked(self):
+        return self.encrypted and self.decrypted is None
 
-    def init_ui(self):
-        layout = QHBoxLayout()
-        self.setLayout(layout)
+    def display_text(self):
+        if self.locked:
+            return f"{self.timestamp}: *************"
+        return f"{self.timestamp}: {self.decrypted if self.encrypted else self.message}"
 
-        self.label = QLabel()
-        
-        # Use QPalette to ensure text is visible in any theme by default
-        palette = self.label.palette()
-        palette.setColor(self.label.foregroundRole(), Qt.black)
-        self.label.setPalette(palette)
-        
-        # Set font and other properties
-        font = QFont('Segoe UI', 13)
-        self.label.setFont(font)
-        self.label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.label.setWordWrap(True)
-        layout.addWidget(self.label, stretch=1)
-
-        # Apply initial theme-aware styles
-        self._apply_styles()
-
-        if self.encrypted:
-            self.label.setText(f"{self.timestamp}: *************")
-            self.decrypt_btn = QPushButton("Decrypt")
-            self.decrypt_btn.setMaximumWidth(120)
-            self.decrypt_btn.clicked.connect(self.decrypt_message)
-            layout.addWidget(self.decrypt_btn)
-        else:
-            self.label.setText(f"{self.timestamp}: {self.plain_message}")
 
-    def update_theme(self, is_dark):
-        """Updates the widget's color based on the new theme."""
-        self.is_dark = is_dark
-        self._apply_styles()
-
-    def _apply_styles(self):
-        """Sets the stylesheet based on the current theme and encryption status."""
-        if self.is_dark:
-            # Dark mode colors
-            bg_color = "#5c1a33" if self.encrypted else "#1a4f5c"
-            btn_bg_color = "#e91e63"
-            btn_hover_color = "#c2185b"
-            text_color = "white"
-        else:
-            # Original light mode colors
-            bg_color = "#ffecf1" if self.encrypted else "#e0f7fa"
-            btn_bg_color = "#ff4081"
-            btn_hover_color = "#f50057"
-            text_color = "black"
-            
-        # Ensure text color is set correctly if it's not handled by the main stylesheet
-        palette = self.label.palette()
-        palette.setColor(self.label.foregroundRole(), Qt.black if not self.is_dark else Qt.white)
-        self.label.setPalette(palette)
-
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-                border-radius: 10px;
-                padding: 10px;
-                margin-bottom: 10px;
-            }}
-            QPushButton {{
-                background-color: {btn_bg_color};
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 5px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {btn_hover_color};
-            }}
-        """)
-
-    def decrypt_message(self):
-        pwd, ok = QInputDialog.getText(self, "Password", "Enter password to decrypt:", QLineEdit.Password)
-        if not ok or not pwd:
+class LogListModel(QAbstractListModel):
+    """The log entries as a flat list model; rows are painted by LogEntryDelegate."""
+    EntryRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.display_text()
+        if role == self.EntryRole:
+            return entry
+        return None
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = list(entries)
+        self.endResetModel()
+
+    def prepend_entries(self, entries):
+        if not entries:
             return
-        fernet = self.key_callback(pwd)
-        if not fernet:
-            QMessageBox.warning(self, "Error", "Failed to derive key.")
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        self.entries[:0] = entries
+        self.endInsertRows()
+
+    def append_entries(self, entries):
+        if not entries:
             return
-        try:
-            decrypted = fernet.decrypt(self.encrypted_message.encode()).decode()
-            self.label.setText(f"{self.timestamp}: {decrypted}")
-            self.decrypt_btn.setDisabled(True)
-        except InvalidToken:
-            QMessageBox.warning(self, "Error", "Invalid password or corrupted data.")
+        row = len(self.entries)
+        self.beginInsertRows(QModelIndex(), row, row + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+    def remove_rows(self, first, count):
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+        del self.entries[first:first + count]
+        self.endRemoveRows()
+
+    def refresh(self):
+        """Repaints every row after entries changed in place (e.g. a batch was decrypted)."""
+        if self.entries:
+            self.dataChanged.emit(self.index(0), self.index(len(self.entries) - 1))
+
+    def append_entry(self, entry):
+        row = len(self.entries)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.entries.append(entry)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_entries([])
+
+
+class LogEntryDelegate(QStyledItemDelegate):
+    """
+    Paints a log entry as a rounded card with a "Decrypt" button for locked
+    entries. Only visible rows are painted, and a theme change is a flag
+    flip followed by one repaint.
+    """
+    decrypt_requested = pyqtSignal(QModelIndex)
+
+    MARGIN = 5       # space around each card
+    PADDING = 10     # space inside the card
+    BUTTON_SIZE = QSize(100, 30)
+
+    # is_dark -> colors of the card, text and button
+    THEMES = {
+        False: {"plain_bg": "#e0f7fa", "encrypted_bg": "#ffecf1", "text": "black",
+                "button": "#ff4081", "button_hover": "#f50057"},
+        True: {"plain_bg": "#1a4f5c", "encrypted_bg": "#5c1a33", "text": "white",
+               "button": "#e91e63", "button_hover": "#c2185b"},
+    }
+
+    def __init__(self, view, is_dark=False):
+        super().__init__(view)
+        self.view = view
+        self.font = QFont('Segoe UI', 13)
+        self.button_font = QFont('Segoe UI', 10, QFont.Bold)
+        self.metrics = QFontMetrics(self.font)
+        self.palettes = {dark: {name: QColor(value) for name, value in theme.items()}
+                         for dark, theme in self.THEMES.items()}
+        self.set_dark(is_dark)
+
+    def set_dark(self, is_dark):
+        self.is_dark = is_dark
+        self.colors = self.palettes[is_dark]
+
+    def card_rect(self, rect):
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def button_rect(self, rect):
+        card = self.card_rect(rect)
+        size = self.BUTTON_SIZE
+        return QRect(card.right() - self.PADDING - size.width(),
+                     card.center().y() - size.height() // 2, size.width(), size.height())
+
+    def text_rect(self, rect, locked):
+        text = self.card_rect(rect).adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        if locked:
+            text.setRight(text.right() - self.BUTTON_SIZE.width() - self.PADDING)
+        return text
+
+    def paint(self, painter, option, index):
+        entry = index.data(LogListModel.EntryRole)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(option.palette.highlight().color(), 2))
+        else:
+            painter.setPen(Qt.NoPen)
+        painter.setBrush(self.colors["encrypted_bg" if entry.encrypted else "plain_bg"])
+        painter.drawRoundedRect(self.card_rect(option.rect), 10, 10)
+
+        painter.setFont(self.font)
+        painter.setPen(self.colors["text"])
+        painter.drawText(self.text_rect(option.rect, entry.locked),
+                         Qt.TextWordWrap | Qt.AlignVCenter, entry.display_text())
+
+        if entry.locked:
+            button = self.button_rect(option.rect)
+            cursor = self.view.viewport().mapFromGlobal(QCursor.pos())
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.colors["button_hover" if button.contains(cursor) else "button"])
+            painter.drawRoundedRect(button, 5, 5)
+            painter.setFont(self.button_font)
+            painter.setPen(Qt.white)
+            painter.drawText(button, Qt.AlignCenter, "Decrypt")
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        entry = index.data(LogListModel.EntryRole)
+        width = self.view.viewport().width()
+        # Stylesheet changes (like the theme toggle) make the view lay out every
+        # row again; only a new width or unlocking an entry changes its height
+        cached = entry.size_cache
+        if cached is not None and cached[0] == width and cached[1] == entry.locked:
+            return QSize(width, cached[2])
+        text = self.text_rect(QRect(0, 0, width, 0), entry.locked)
+        height = self.metrics.boundingRect(QRect(0, 0, max(text.width(), 50), 0),
+                                           Qt.TextWordWrap, entry.display_text()).height()
+        if entry.locked:
+            height = max(height, self.BUTTON_SIZE.height())
+        height += 2 * (self.MARGIN + self.PADDING)
+        entry.size_cache = (width, entry.locked, height)
+        return QSize(width, height)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            entry = index.data(LogListModel.EntryRole)
+            if entry.locked and self.button_rect(option.rect).contains(event.pos()):
+                self.decrypt_requested.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
 
 
 class LogTab(QWidget):
     def __init__(self, parent=None, main_window=None):
         super().__init__(parent)
         self.main_window = main_window
-        self.entries = []
-        self.temp_file_path = os.path.join("other", "temporal_log.txt")
-        
-        # Ensure the 'other' directory exists
-        os.makedirs(os.path.dirname(self.temp_file_path), exist_ok=True)
+        self.key_cache = KeyCache()
+        self.decrypt_thread = None
+        self.decrypted_texts = {}  # entry number -> plain text, for entries unlocked this session
+        # Creates the 'other' directory and migrates an old text log on first use
+        self.store = LogStore()
+        self.log_index = LogIndex(self.store)
+        self.index_thread = None
 
         self.init_ui()
         self.load_existing_logs()
+        self.update_index()
+
+        # Derived keys expire after KEY_TTL seconds without use
+        self.key_purge_timer = QTimer(self)
+        self.key_purge_timer.timeout.connect(self.key_cache.purge)
+        self.key_purge_timer.start(60 * 1000)
 
-        # Connect to the main window's theme changed signal to update existing widgets
+        # Connect to the main window's theme changed signal to repaint the entries
         if self.main_window:
             self.main_window.theme_changed.connect(self.update_all_themes)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.log_container = QWidget()
-        self.log_container.setObjectName("logContainer")
-        self.log_layout = QVBoxLayout(self.log_container)
-        self.log_layout.setAlignment(Qt.AlignTop)
-        self.scroll_area.setWidget(self.log_container)
-        layout.addWidget(self.scroll_area)
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search logs (whole words or beginnings of words)...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+        search_layout.addWidget(self.search_input)
+        self.search_status = QLabel("")
+        search_layout.addWidget(self.search_status)
+        layout.addLayout(search_layout)
+
+        # Search as the user types, once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+
+        is_dark = self.main_window.is_dark_mode if self.main_window else False
+        self.model = LogListModel(self)
+        self.search_model = LogListModel(self)  # shown instead of 'model' while searching
+        self.log_view = QListView()
+        self.log_view.setObjectName("logContainer")
+        self.log_view.setModel(self.model)
+        self.delegate = LogEntryDelegate(self.log_view, is_dark)
+        self.delegate.decrypt_requested.connect(self.decrypt_entry)
+        self.log_view.setItemDelegate(self.delegate)
+        self.log_view.setMouseTracking(True)  # hover color of the Decrypt buttons
+        self.log_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.log_view.setResizeMode(QListView.Adjust)  # re-wrap rows when the width changes
+        self.log_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        self.log_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        copy_action = QAction("Copy", self.log_view)
+        copy_action.setShortcut("Ctrl+C")
+        copy_action.setShortcutContext(Qt.WidgetShortcut)
+        copy_action.triggered.connect(self.copy_selected)
+        self.log_view.addAction(copy_action)
+        self.log_view.setContextMenuPolicy(Qt.ActionsContextMenu)
+        layout.addWidget(self.log_view)
 
         input_widgets_container = QWidget()
         input_layout = QVBoxLayout(input_widgets_container)
@@ -167,6 +299,10 @@ class LogTab(QWidget):
         self.log_btn.clicked.connect(self.add_log)
         btn_layout.addWidget(self.log_btn)
 
+        self.decrypt_all_btn = QPushButton("Decrypt All...")
+        self.decrypt_all_btn.clicked.connect(self.decrypt_all)
+        btn_layout.addWidget(self.decrypt_all_btn)
+
         self.delete_btn = QPushButton("Delete Temp Log File")
         self.delete_btn.clicked.connect(self.delete_temp_file)
         btn_layout.addWidget(self.delete_btn)
@@ -176,17 +312,124 @@ class LogTab(QWidget):
 
     @pyqtSlot(bool)
     def update_all_themes(self, is_dark):
-        """Loops through all existing log entries and tells them to update their theme."""
-        for entry_widget in self.entries:
-            entry_widget.update_theme(is_dark)
+        """Switches the delegate's colors and repaints the visible rows."""
+        self.delegate.set_dark(is_dark)
+        self.log_view.viewport().update()
+
+    def decrypt_entry(self, index):
+        pwd, ok = QInputDialog.getText(self, "Password", "Enter password to decrypt:", QLineEdit.Password)
+        if not ok or not pwd:
+            return
+        entry = index.data(LogListModel.EntryRole)
+        self.start_decryption(decrypt_tokens, self.key_cache, pwd, [(entry.number, entry.message)])
+
+    def decrypt_all(self):
+        """Decrypts every encrypted entry of the log, including pages not loaded yet."""
+        pwd, ok = QInputDialog.getText(self, "Password", "Decrypt all entries with this password:", QLineEdit.Password)
+        if not ok or not pwd:
+            return
+        self.start_decryption(decrypt_store, self.key_cache, pwd, self.store)
+
+    def start_decryption(self, func, *args):
+        """Runs a decrypt_tokens generator on a worker thread; results arrive in batches."""
+        if self.decrypt_thread is not None and self.decrypt_thread.isRunning():
+            QMessageBox.information(self, "Please Wait", "A decryption is already running.")
+            return
+        self.decrypt_all_btn.setEnabled(False)
+        self.decrypt_thread, self.decrypt_worker = start_worker(
+            func, *args, on_progress=self.on_decrypt_batch,
+            on_finished=self.on_decrypt_finished, on_error=self.on_decrypt_error)
+
+    def on_decrypt_batch(self, progress):
+        done, total, results = progress
+        for number, text in results:
+            if text is not None:
+                self.decrypted_texts[number] = text
+                # Searchable for this session only; decrypted text never reaches the index file
+                self.log_index.add_decrypted(number, text)
+        for model in (self.model, self.search_model):
+            self.apply_decrypted(model.entries)
+        self.log_view.model().refresh()
+        self.log_view.scheduleDelayedItemsLayout()  # decrypted rows may wrap to more lines
+        self.decrypt_all_btn.setText(f"Decrypting... {done}/{total}")
+
+    def apply_decrypted(self, entries):
+        """Unlocks the entries already decrypted this session (e.g. on pages loaded after a Decrypt All)."""
+        for entry in entries:
+            if entry.locked and entry.number in self.decrypted_texts:
+                entry.decrypted = self.decrypted_texts[entry.number]
+        return entries
+
+    def on_decrypt_finished(self, result):
+        decrypted, failed = result
+        self.decrypt_all_btn.setText("Decrypt All...")
+        self.decrypt_all_btn.setEnabled(True)
+        if not decrypted and not failed:
+            QMessageBox.information(self, "Nothing to Decrypt", "There are no encrypted entries to decrypt.")
+        elif not decrypted:
+            QMessageBox.warning(self, "Error", "Invalid password or corrupted data.")
+        elif failed:
+            QMessageBox.information(self, "Decrypted",
+                                    f"Decrypted {decrypted} entries. {failed} use a different password.")
+
+    def on_decrypt_error(self, message):
+        self.decrypt_all_btn.setText("Decrypt All...")
+        self.decrypt_all_btn.setEnabled(True)
+        QMessageBox.warning(self, "Error", f"Decryption failed: {message}")
+
+    def reset_process(self):
+        stop_thread(self.decrypt_thread)
+        if self.index_thread is not None and self.index_thread.isRunning():
+            self.log_index.cancel()
+        stop_thread(self.index_thread)
+        self.key_cache.clear()
+        self.decrypted_texts.clear()
+
+    def update_index(self):
+        """Indexes, on a worker thread, whatever the log gained outside save_log (all of it the first time)."""
+        self.index_thread, self.index_worker = start_worker(
+            self.log_index.catch_up,
+            on_error=lambda message: print(f"[LogTab] Search index update failed: {message}"))
+
+    def run_search(self):
+        query = self.search_input.text().strip()
+        if not query:
+            self.search_status.setText("")
+            self.log_view.setModel(self.model)
+            self.log_view.scrollToBottom()
+            return
+        numbers = self.log_index.search(query)
+        loaded = {entry.number: entry for entry in self.model.entries}
+        results = []
+        for number in numbers:
+            entry = loaded.get(number)
+            if entry is None:
+                found = self.store.read(number)
+                if found is None:
+                    continue
+                _, timestamp, encrypted, message = found
+                entry = LogEntry(number, timestamp, message, encrypted)
+                self.apply_decrypted([entry])
+            results.append(entry)
+        self.search_model.set_entries(results)
+        self.log_view.setModel(self.search_model)
+        more = "+" if len(numbers) >= RESULT_LIMIT else ""
+        self.search_status.setText(f"{len(results)}{more} results")
+
+    def copy_selected(self):
+        rows = sorted(index.row() for index in self.log_view.selectedIndexes())
+        if rows:
+            entries = self.log_view.model().entries
+            QApplication.clipboard().setText("\n".join(entries[row].display_text() for row in rows))
 
     def derive_key(self, password):
         if not password:
             return None
-        # Use a securely generated salt in a real application
-        salt = b'gindumac_static_salt_' 
-        key = pbkdf2_hmac('sha256', password.encode(), salt, 100000, dklen=32)
-        return Fernet(base64.urlsafe_b64encode(key))
+        fernet = self.key_cache.get(password)
+        if fernet is None:
+            fernet = derive_key(password)
+            self.key_cache.put(password, fernet)
+        return fernet
 
     def add_log(self):
         message = self.msg_input.toPlainText().strip()
@@ -194,8 +437,8 @@ class LogTab(QWidget):
             return
             
         encrypted = self.encrypt_checkbox.isChecked()
+        at_end = not self.reader.has_newer
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        is_dark = self.main_window.is_dark_mode if self.main_window else False
 
         if encrypted:
             password = self.pwd_input.text()
@@ -204,72 +447,133 @@ class LogTab(QWidget):
                 return
             fernet = self.derive_key(password)
             encrypted_message = fernet.encrypt(message.encode()).decode()
-            entry_widget = LogEntryWidget(timestamp, encrypted_message, True, self.derive_key, is_dark)
-            self.save_log(timestamp, encrypted_message, encrypted=True)
+            number = self.save_log(timestamp, encrypted_message, encrypted=True)
+            entry = LogEntry(number, timestamp, encrypted_message, True)
         else:
-            entry_widget = LogEntryWidget(timestamp, message, False, None, is_dark)
-            self.save_log(timestamp, message, encrypted=False)
+            number = self.save_log(timestamp, message, encrypted=False)
+            entry = LogEntry(number, timestamp, message, False)
+        if number is None:
+            return
 
-        self.log_layout.addWidget(entry_widget)
-        self.entries.append(entry_widget)
+        if at_end:
+            self.model.append_entry(entry)
+            self.reader.end = number + 1
+        else:
+            # The newest rows were dropped while scrolling back; jump to the end of the log
+            self.load_existing_logs()
+        self.log_view.scrollToBottom()
         self.msg_input.clear()
         self.pwd_input.clear()
         self.encrypt_checkbox.setChecked(False)
 
     def save_log(self, timestamp, message, encrypted=False):
-        flag = "ENC" if encrypted else "PLAIN"
-        line = f"{timestamp}|||{flag}|||{message}\n"
+        """Appends one entry and adds it to the search index. Returns its entry number, or None on error."""
         try:
-            with open(self.temp_file_path, 'a', encoding='utf-8') as f:
-                f.write(line)
+            number = self.store.append(timestamp, encrypted, message)
         except IOError as e:
             QMessageBox.critical(self, "Save Error", f"Could not write to log file:\n{e}")
+            return None
+        self.log_index.add_entry(number, None if encrypted else message)
+        return number
 
     def load_existing_logs(self):
-        if not os.path.exists(self.temp_file_path):
-            return
-        is_dark = self.main_window.is_dark_mode if self.main_window else False
+        """Shows the newest page of the log; older pages load as the user scrolls up."""
+        self.reader = TailReader(self.store)
+        self.model.set_entries(self.read_entries())
+        self.log_view.scrollToBottom()
+        # Keep loading until the view can scroll, otherwise there is no way to reach older pages
+        QTimer.singleShot(0, self.fill_view)
+
+    def read_entries(self, read_page=None):
         try:
-            with open(self.temp_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    parts = line.split("|||", 2)
-                    if len(parts) != 3:
-                        continue # Skip malformed lines
-
-                    timestamp, flag, message = parts
-                    encrypted = flag == "ENC"
-                    
-                    widget = LogEntryWidget(timestamp, message, encrypted, self.derive_key, is_dark)
-                    self.log_layout.addWidget(widget)
-                    self.entries.append(widget)
-        except IOError as e:
-            QMessageBox.critical(self, "Load Error", f"Could not read from log file:\n{e}")
+            return self.apply_decrypted([LogEntry(number, timestamp, message, encrypted)
+                                         for number, timestamp, encrypted, message
+                                         in (read_page or self.reader.read_page)()])
         except Exception as e:
-            QMessageBox.critical(self, "Parsing Error", f"An error occurred while parsing the log file:\n{e}")
+            QMessageBox.critical(self, "Load Error", f"Could not read from log file:\n{e}")
+            return []
+
+    def fill_view(self):
+        if self.log_view.model() is not self.model:
+            return
+        scroll_bar = self.log_view.verticalScrollBar()
+        while self.reader.has_more and scroll_bar.maximum() == 0:
+            self.model.prepend_entries(self.read_entries())
+            self.log_view.doItemsLayout()
+        self.log_view.scrollToBottom()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The viewport only has its real size once the tab is shown
+        QTimer.singleShot(0, self.fill_view)
+
+    def on_scroll(self, value):
+        if self.log_view.model() is not self.model:
+            return  # search results are not paginated
+        scroll_bar = self.log_view.verticalScrollBar()
+        if value == scroll_bar.minimum() and self.reader.has_more:
+            self.load_older_page()
+        elif value == scroll_bar.maximum() and self.reader.has_newer:
+            self.load_newer_page()
+
+    # At most MAX_LOADED_ROWS rows stay in the model: every insert makes the
+    # view lay out all its rows again, so paging must not get slower as the
+    # user scrolls through the history. Pages beyond the limit are dropped on
+    # the far side and read again from the store when scrolled back to.
+
+    def load_older_page(self):
+        entries = self.read_entries()
+
+        def change():
+            self.model.prepend_entries(entries)
+            excess = len(self.model.entries) - MAX_LOADED_ROWS
+            if excess > 0:
+                self.reader.end = self.model.entries[-excess].number
+                self.model.remove_rows(len(self.model.entries) - excess, excess)
+        self.keep_rows_in_place(change)
+
+    def load_newer_page(self):
+        entries = self.read_entries(self.reader.read_newer_page)
+
+        def change():
+            self.model.append_entries(entries)
+            excess = len(self.model.entries) - MAX_LOADED_ROWS
+            if excess > 0:
+                self.model.remove_rows(0, excess)
+                self.reader.position = self.model.entries[0].number
+        self.keep_rows_in_place(change)
+
+    def keep_rows_in_place(self, change):
+        """Applies a model change without moving the rows on screen."""
+        top = self.log_view.indexAt(QPoint(0, 0))
+        anchor = top.data(LogListModel.EntryRole) if top.isValid() else None
+        offset = self.log_view.visualRect(top).top() if anchor is not None else 0
+        change()
+        self.log_view.doItemsLayout()  # now, so the anchor row has its final position
+        if anchor is None:
+            return
+        row = next((i for i, entry in enumerate(self.model.entries) if entry is anchor), None)
+        if row is not None:
+            scroll_bar = self.log_view.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.value() + self.log_view.visualRect(self.model.index(row)).top() - offset)
 
     def delete_temp_file(self):
         reply = QMessageBox.question(self, "Confirm Deletion", 
-                                     "Are you sure you want to permanently delete the temporary log file?",
+                                     "Are you sure you want to permanently delete the temporary log files?",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            if os.path.exists(self.temp_file_path):
+            if self.store.count():
                 try:
-                    os.remove(self.temp_file_path)
-                    QMessageBox.information(self, "Deleted", "Temporary log file has been deleted.")
+                    self.store.clear()
+                    QMessageBox.information(self, "Deleted", "Temporary log files have been deleted.")
                     self.clear_log_widgets()
                 except OSError as e:
                     QMessageBox.critical(self, "Error", f"Could not delete file:\n{e}")
 
     def clear_log_widgets(self):
-        for i in reversed(range(self.log_layout.count())):
-            widget_item = self.log_layout.itemAt(i)
-            if widget_item:
-                widget = widget_item.widget()
-                if widget:
-                    widget.setParent(None)
-                    widget.deleteLater()
-        self.entries.clear()
\ No newline at end of file
+        self.model.clear()
+        self.search_model.clear()
+        self.search_input.clear()
+        self.reader = TailReader(self.store)
+        self.log_index.clear()
+        self.decrypted_texts.clear()  # entry numbers start over
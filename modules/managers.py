@@ -2,27 +2,47 @@ import json
 from PyQt5.QtWidgets import (QDialog, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QTextEdit, QMessageBox, QDialogButtonBox,
                              QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
-                             QTabWidget, QListWidget, QInputDialog, QListWidgetItem)
+                             QTabWidget, QListWidget, QInputDialog, QListWidgetItem, QLabel)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+
+from .regex_guard import profile_rules, RULE_TIME_BUDGET_MS
+from .worker import start_worker, stop_thread
+
+SAMPLE_CORPUS_FILE = "regex/sample_corpus.json"
 
 class RuleManagerDialog(QDialog):
     def __init__(self, rules, parent=None):
         super().__init__(parent)
         self.rules = json.loads(json.dumps(rules))
+        self.samples = self.load_samples()
+        self.profile_thread = None
+        self.profile_worker = None
+        self.profiled_rules = []
+        self.after_profile = None
         self.setWindowTitle("Parsing Rule Manager")
-        self.setMinimumSize(800, 600)
+        self.setMinimumSize(900, 600)
         layout = QVBoxLayout(self)
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Rule Name", "Type", "Value", "Pattern (Regex)"])
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Rule Name", "Type", "Value", "Pattern (Regex)",
+                                              "Max Time (ms)", "Hit Rate"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.table)
+        self.profile_label = QLabel(f"Sample corpus: {len(self.samples)} messages "
+                                    f"| Time budget: {RULE_TIME_BUDGET_MS} ms per rule")
+        layout.addWidget(self.profile_label)
         button_layout = QHBoxLayout()
         add_btn = QPushButton("Add Rule")
         add_btn.clicked.connect(self.add_row)
         remove_btn = QPushButton("Remove Selected Rule")
         remove_btn.clicked.connect(self.remove_row)
+        self.profile_btn = QPushButton("Profile Rules")
+        self.profile_btn.clicked.connect(lambda: self.run_profile())
         button_layout.addWidget(add_btn)
         button_layout.addWidget(remove_btn)
+        button_layout.addWidget(self.profile_btn)
+        self.edit_widgets = [self.table, add_btn, remove_btn, self.profile_btn]
         layout.addLayout(button_layout)
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.button_box.accepted.connect(self.accept_changes)
@@ -40,8 +60,16 @@ class RuleManagerDialog(QDialog):
             self.table.setCellWidget(row, 1, combo)
             self.table.setItem(row, 2, QTableWidgetItem(rule.get("value", "")))
             self.table.setItem(row, 3, QTableWidgetItem(rule.get("pattern", "")))
+            self.set_profile_cells(row, None)
 
-    def accept_changes(self):
+    def load_samples(self):
+        try:
+            with open(SAMPLE_CORPUS_FILE, 'r', encoding='utf-8') as f:
+                return [text for text in json.load(f) if isinstance(text, str)]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def read_table_rules(self):
         new_rules = []
         for row in range(self.table.rowCount()):
             rule = {
@@ -51,7 +79,81 @@ class RuleManagerDialog(QDialog):
                 "pattern": self.table.item(row, 3).text()
             }
             new_rules.append(rule)
-        self.rules = new_rules
+        return new_rules
+
+    def set_profile_cells(self, row, stats):
+        """Fills the read-only timing/hit-rate cells of a row (empty when not profiled yet)."""
+        time_item = QTableWidgetItem("" if stats is None else f"{stats['max_ms']:.2f}")
+        hit_item = QTableWidgetItem("" if stats is None else f"{stats['hit_rate']:.0%}")
+        for item in (time_item, hit_item):
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            if stats and stats["flagged"]:
+                item.setBackground(QColor("#f8d7da"))
+                item.setForeground(QColor("black"))
+                item.setToolTip(stats["reason"])
+        self.table.setItem(row, 4, time_item)
+        self.table.setItem(row, 5, hit_item)
+
+    def run_profile(self, then=None):
+        """
+        Runs every rule against the sample corpus in a worker thread. 'then'
+        is called with the names of the flagged rules once the report is shown.
+        """
+        if self.profile_thread is not None:
+            return
+        self.profiled_rules = self.read_table_rules()
+        self.after_profile = then
+        for widget in self.edit_widgets + [self.button_box]:
+            widget.setEnabled(False)  # the report is matched to the rows by position
+        self.profile_label.setText(f"Profiling {len(self.profiled_rules)} rules on {len(self.samples)} samples...")
+        self.profile_thread, self.profile_worker = start_worker(
+            profile_rules, self.profiled_rules, self.samples,
+            on_finished=self.on_profile_finished, on_error=self.on_profile_error,
+            on_done=self.on_profile_thread_done)
+
+    def on_profile_finished(self, report):
+        rules = self.profiled_rules
+        flagged = []
+        for row, stats in enumerate(report):
+            self.set_profile_cells(row, stats)
+            if stats["flagged"]:
+                flagged.append(f"{rules[row]['name']}: {stats['reason']}")
+        self.profile_label.setText(f"Profiled {len(rules)} rules on {len(self.samples)} samples "
+                                   f"| Flagged: {len(flagged)}")
+        self.enable_editing()
+        if self.after_profile is not None:
+            self.after_profile(flagged)
+
+    def on_profile_error(self, message):
+        self.profile_label.setText(f"Profiling failed: {message}")
+        self.enable_editing()
+
+    def on_profile_thread_done(self):
+        self.profile_thread = None
+        self.profile_worker = None
+
+    def enable_editing(self):
+        for widget in self.edit_widgets + [self.button_box]:
+            widget.setEnabled(True)
+
+    def done(self, result):
+        self.after_profile = None  # a closed dialog saves nothing
+        stop_thread(self.profile_thread)
+        super().done(result)
+
+    def accept_changes(self):
+        self.run_profile(self.save_rules)
+
+    def save_rules(self, flagged):
+        if flagged:
+            reply = QMessageBox.question(self, "Slow or Invalid Rules",
+                                         "These rules were flagged by the profiler:\n\n"
+                                         + "\n".join(flagged)
+                                         + "\n\nFlagged rules are skipped at runtime when they time out. Save anyway?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        self.rules = self.read_table_rules()
         self.accept()
 
     def add_row(self):
@@ -63,6 +165,7 @@ class RuleManagerDialog(QDialog):
         self.table.setCellWidget(new_row_index, 1, combo)
         self.table.setItem(new_row_index, 2, QTableWidgetItem(""))
         self.table.setItem(new_row_index, 3, QTableWidgetItem(""))
+        self.set_profile_cells(new_row_index, None)
 
     def remove_row(self):
         current_row = self.table.currentRow()
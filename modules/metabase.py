@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel, QPushBut
 # --- FIX: Added 'Qt' to the import list here ---
 from PyQt5.QtCore import pyqtSignal, Qt
 from .email_logic import get_lead_email_generator
+from .event_recorder import record_event, METABASE
 
 class EmailGeneratorTab(QWidget):
     output_message = pyqtSignal(str)
@@ -106,6 +107,7 @@ class EmailGeneratorTab(QWidget):
         try:
             data = next(self.email_generator_obj)
             pyperclip.copy(data["message"])
+            record_event(METABASE)
             self.email_display_text.setText(data["message"])
             info = f"Email: {data['email']} | Country: {data['country']}"
             self.current_info_label.setText(f"Current: {info}")
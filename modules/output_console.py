@@ -0,0 +1,122 @@
+# modules/output_console.py
+
+"""
+The "Application Output" console of MainWindow.
+
+Tabs can emit hundreds of output_message signals per second during bulk
+runs. Instead of inserting each one into the document, OutputConsole
+queues them and appends the whole queue once per FLUSH_INTERVAL_MS. The
+view keeps only the last MAX_BLOCKS lines (older ones are dropped by Qt),
+a ring buffer keeps the last HISTORY_SIZE messages for the "Copy History" /
+"Save History..." context menu actions, and an optional log file receives
+everything, one write per flush.
+"""
+
+import os
+from collections import deque
+
+from PyQt5.QtCore import QTimer, pyqtSlot
+from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox, QPlainTextEdit
+
+FLUSH_INTERVAL_MS = 50
+MAX_BLOCKS = 5000
+HISTORY_SIZE = 20000
+LOG_MAX_BYTES = 5 * 1024 * 1024  # the log file is rotated to <name>.1 past this size
+
+
+class OutputConsole(QPlainTextEdit):
+    def __init__(self, parent=None, log_path=None):
+        super().__init__(parent)
+        self.setObjectName("output_console")
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setFont(QFont("Courier", 10))
+        self.setMaximumBlockCount(MAX_BLOCKS)
+
+        self.pending = []
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.log_path = log_path
+        self.log_file = None
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    @pyqtSlot(str)
+    def write(self, message):
+        """Queues a message; it appears with the others at the next flush."""
+        self.pending.append(message)
+        self.history.append(message)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending = []
+
+        scroll_bar = self.verticalScrollBar()
+        follow = scroll_bar.value() == scroll_bar.maximum()  # don't pull the user away from older output
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if follow:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+        self.write_log(text)
+
+    def write_log(self, text):
+        if not self.log_path:
+            return
+        try:
+            if self.log_file is None:
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > LOG_MAX_BYTES:
+                    os.replace(self.log_path, self.log_path + ".1")
+                self.log_file = open(self.log_path, "a", encoding="utf-8")
+            self.log_file.write(text)
+            self.log_file.flush()
+            if self.log_file.tell() > LOG_MAX_BYTES:
+                # Closed here, rotated when the next flush reopens it
+                self.log_file.close()
+                self.log_file = None
+        except OSError as e:
+            print(f"[OutputConsole] Could not write to {self.log_path}: {e}")
+            self.log_path = None
+
+    def history_text(self):
+        """The last HISTORY_SIZE messages, including those already dropped from the view."""
+        return "".join(self.history)
+
+    def contextMenuEvent(self, event):
+        menu = self.createStandardContextMenu()
+        menu.addSeparator()
+        menu.addAction("Copy History", self.copy_history)
+        menu.addAction("Save History...", self.save_history)
+        menu.exec_(event.globalPos())
+        menu.deleteLater()
+
+    def copy_history(self):
+        self.flush()
+        QApplication.clipboard().setText(self.history_text())
+
+    def save_history(self):
+        self.flush()
+        filename, _ = QFileDialog.getSaveFileName(self, "Save History", "output_history.txt", "Text (*.txt)")
+        if not filename:
+            return
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.history_text())
+        except OSError as e:
+            QMessageBox.critical(self, "Save Error", f"Could not write the history:\n{e}")
+
+    def close_log(self):
+        """Flushes what is still queued and closes the log file."""
+        self.flush_timer.stop()
+        self.flush()
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
@@ -0,0 +1,179 @@
+# modules/regex_guard.py
+
+"""
+Time-limited regex matching for user-editable parsing rules, plus a profiler
+used by the Rule Manager to flag slow patterns before they are saved.
+
+Python's 're' cannot be interrupted, so matches are guarded either with the
+optional 'regex' package (pip install regex), which supports a timeout
+natively, or by running the match in a helper process that is killed when
+it runs out of time.
+"""
+
+import re
+import threading
+import time
+
+try:
+    import regex as _regex
+    # Without the package installed, the repo's own 'regex/' rules folder is
+    # picked up as an empty namespace package.
+    if not hasattr(_regex, "search"):
+        _regex = None
+except ImportError:
+    _regex = None
+
+# Runtime limit for a single rule match, in seconds
+RULE_TIMEOUT = 0.5
+# Rules slower than this on any sample are flagged by the profiler, in ms
+RULE_TIME_BUDGET_MS = 50
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class RegexTimeout(Exception):
+    """Raised when a pattern takes longer than its time limit."""
+
+
+def _search_groups(pattern, text, flags):
+    match = re.search(pattern, text, flags)
+    return (match.group(0),) + match.groups() if match else None
+
+
+def _count_matches(pattern, text, flags):
+    return sum(1 for _ in re.finditer(pattern, text, flags))
+
+
+def _timed_search(pattern, text, flags):
+    """_search_groups plus its run time in ms, measured where the match runs."""
+    start = time.perf_counter()
+    match = _search_groups(pattern, text, flags)
+    return match, (time.perf_counter() - start) * 1000
+
+
+def _get_pool():
+    import multiprocessing
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = multiprocessing.Pool(processes=1)
+        return _pool
+
+
+def _kill_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+            _pool = None
+
+
+def _run_in_helper(func, pattern, text, flags, timeout):
+    """Runs func(pattern, text, flags) in the helper process, killing it after 'timeout' seconds."""
+    # Imported here: multiprocessing is the slowest import of the parsing core
+    import multiprocessing
+    if multiprocessing.parent_process() is not None:
+        # Already inside a worker process (batch mode): daemonic workers
+        # cannot start a pool, so lead_batch.parse_batch bounds the whole
+        # message instead.
+        return func(pattern, text, flags)
+    result = _get_pool().apply_async(func, (pattern, text, flags))
+    try:
+        return result.get(timeout)
+    except multiprocessing.TimeoutError:
+        _kill_pool()
+        raise RegexTimeout(f"Pattern exceeded {timeout}s")
+
+
+def _regex_call(func, timeout):
+    """Runs func() using the 'regex' package, mapping its errors to RegexTimeout and re.error."""
+    try:
+        return func()
+    except TimeoutError:
+        raise RegexTimeout(f"Pattern exceeded {timeout}s")
+    except _regex.error as e:
+        raise re.error(str(e))
+
+
+def guarded_search(pattern, text, flags=0, timeout=RULE_TIMEOUT):
+    """
+    Like re.search, but gives up after 'timeout' seconds with RegexTimeout.
+    Returns a tuple (whole match, group 1, group 2, ...) or None.
+    """
+    if timeout is None:
+        return _search_groups(pattern, text, flags)
+    if _regex is not None:
+        match = _regex_call(lambda: _regex.search(pattern, text, flags, timeout=timeout), timeout)
+        return (match.group(0),) + match.groups() if match else None
+    return _run_in_helper(_search_groups, pattern, text, flags, timeout)
+
+
+def guarded_count(pattern, text, flags=0, timeout=RULE_TIMEOUT):
+    """Number of non-overlapping matches (like len(re.findall)), or RegexTimeout after 'timeout' seconds."""
+    if timeout is None:
+        return _count_matches(pattern, text, flags)
+    if _regex is not None:
+        return _regex_call(lambda: sum(1 for _ in _regex.finditer(pattern, text, flags, timeout=timeout)), timeout)
+    return _run_in_helper(_count_matches, pattern, text, flags, timeout)
+
+
+def timed_search(pattern, text, flags=0, timeout=RULE_TIMEOUT):
+    """
+    guarded_search that also returns the match time in ms. The time is taken
+    where the match runs, so it does not include the round trip to the
+    helper process.
+    """
+    if timeout is not None and _regex is None:
+        return _run_in_helper(_timed_search, pattern, text, flags, timeout)
+    start = time.perf_counter()
+    match = guarded_search(pattern, text, flags, timeout)
+    return match, (time.perf_counter() - start) * 1000
+
+
+def profile_rules(rules, samples, budget_ms=RULE_TIME_BUDGET_MS, timeout=RULE_TIMEOUT):
+    """
+    Runs every rule against every sample and returns one dict per rule with
+    the average/max match time (ms), the hit rate and whether it was flagged.
+    """
+    report = []
+    for rule in rules:
+        pattern = rule.get('pattern', '')
+        is_language = rule.get('type') == 'language_detect'
+        flags = re.IGNORECASE if is_language else re.IGNORECASE | re.MULTILINE
+        stats = {"avg_ms": 0.0, "max_ms": 0.0, "hit_rate": 0.0,
+                 "flagged": False, "reason": ""}
+        if not pattern:
+            stats.update(flagged=True, reason="Empty pattern")
+            report.append(stats)
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            stats.update(flagged=True, reason=f"Invalid regex: {e}")
+            report.append(stats)
+            continue
+
+        timings, hits = [], 0
+        for sample in samples:
+            text = sample.lower() if is_language else sample
+            try:
+                match, elapsed_ms = timed_search(pattern, text, flags, timeout)
+            except RegexTimeout:
+                # One timeout is enough to reject the rule; skip the other samples
+                stats.update(max_ms=timeout * 1000, flagged=True,
+                             reason=f"Timed out after {timeout * 1000:.0f} ms")
+                timings = []
+                break
+            timings.append(elapsed_ms)
+            if match and (is_language or len(match) > 1):
+                hits += 1
+
+        if timings:
+            stats["avg_ms"] = sum(timings) / len(timings)
+            stats["max_ms"] = max(timings)
+            stats["hit_rate"] = hits / len(samples)
+            if stats["max_ms"] > budget_ms:
+                stats.update(flagged=True, reason=f"Slower than the {budget_ms} ms budget")
+        report.append(stats)
+    return report
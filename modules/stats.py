@@ -1,39 +1,40 @@
 import sys
-import json
-from datetime import date, datetime, timedelta
-from pathlib import Path
+import functools
+import shutil
+import tempfile
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
 from calendar import monthrange
-import os
-from fpdf import *
-import re
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QMainWindow, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTabWidget, QFormLayout, QDialog,
-    QToolTip, QDateEdit, QMessageBox, QComboBox, QMenuBar,QAction, QTextEdit
+    QToolTip, QDateEdit, QMessageBox, QComboBox, QMenuBar,QAction, QTextEdit, QProgressBar, QFileDialog
     )
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QDateTime, QTimer, QPointF
 from PyQt5.QtGui import QPainter, QCursor
 from PyQt5.QtChart import (
     QChartView, QChart, QPieSeries, QPieSlice,
     QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis,
-    QLineSeries
+    QLineSeries, QDateTimeAxis, QStackedBarSeries
 )
 
-DATA_FILE = Path("other/stats_progress.json")
+from .stats_store import StatsStore
+from .stats_index import StatsIndex
+from .event_recorder import get_recorder
+from .stats_engine import metric_report, lttb, PERCENTILES, WEEKDAYS
+from .team_stats import TeamStore
+from .stats_export import export_stats, default_format
+from .worker import start_worker, stop_thread
 
 
-def clean_text_for_pdf(text):
-    # Eliminar todos los caracteres que no sean ASCII imprimibles
-    return re.sub(r'[^\x00-\x7F]+', '', text)
-
 class ConclusionsWindow(QDialog):
-    def __init__(self, stats_data, parent=None):
+    def __init__(self, stats_index, parent=None):
         super().__init__(parent)
         self.setWindowTitle("📊 Conclusiones Estadísticas Avanzadas")
         self.resize(600, 500)
 
-        self.stats_data = stats_data
+        self.stats_index = stats_index
 
         layout = QVBoxLayout(self)
 
@@ -51,15 +52,20 @@ class ConclusionsWindow(QDialog):
         btn_generate.clicked.connect(self.generate_conclusions)
         layout.addWidget(btn_generate)
 
-        btn_export_pdf = QPushButton("📄 Exportar Reporte PDF")
-        btn_export_pdf.setStyleSheet("background-color: #2196F3; color: white; font-weight: bold; padding: 10px;")
-        btn_export_pdf.clicked.connect(self.export_pdf)
-        layout.addWidget(btn_export_pdf)
+        self.btn_export_pdf = QPushButton("📄 Exportar Reporte PDF")
+        self.btn_export_pdf.setStyleSheet("background-color: #2196F3; color: white; font-weight: bold; padding: 10px;")
+        self.btn_export_pdf.clicked.connect(self.export_pdf)
+        layout.addWidget(self.btn_export_pdf)
 
-    def generate_conclusions(self):
-        print("DEBUG stats_data:", self.stats_data)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.report_thread = None
+        self.chart_dir = None
 
-        if not self.stats_data:
+    def generate_conclusions(self):
+        if not len(self.stats_index):
             self.conclusions_area.setPlainText("⚠️ No hay datos para analizar.")
             return
         
@@ -88,43 +94,44 @@ class ConclusionsWindow(QDialog):
             },
         }
 
-        # Aquí vamos a crear un dict para juntar todos los valores por métrica
-        metric_values = {}
-
-        # Recorremos fechas y métricas internas para agrupar valores por cada métrica
-        for date, metrics_dict in self.stats_data.items():
-            for metric, value in metrics_dict.items():
-                try:
-                    num = float(value)
-                except (ValueError, TypeError):
-                    continue
-                metric_values.setdefault(metric, []).append(num)
+        # Estadísticas calculadas por columnas (NumPy si está instalado)
+        reports = {}
+        for metric in self.stats_index.metrics():
+            report = metric_report(self.stats_index, metric)
+            if report["n"]:
+                reports[metric] = report
 
-        if not metric_values:
+        if not reports:
             self.conclusions_area.setPlainText("⚠️ No hay datos numéricos válidos para analizar.")
             return
 
         detalles = ""
-        for metric, values in metric_values.items():
-            n = len(values)
-            media = sum(values) / n
-            minimum = min(values)
-            maximum = max(values)
-            variance = sum((x - media) ** 2 for x in values) / n
-            std_dev = variance ** 0.5
+        for metric, report in reports.items():
+            media = report["mean"]
             kpi_performance = media * 1.15  # KPI ajustado como ejemplo
 
             info = kpi_info.get(metric, {})
             interpretation = info.get("interpretation", "No hay interpretación disponible.")
             optimal = info.get("optimal", "No hay valor óptimo definido.")
 
+            percentiles = ", ".join(f"P{q}: {report[f'p{q}']:.2f}" for q in PERCENTILES)
+            rolling = report["rolling_mean"]
+            rolling_text = f"{rolling:.2f}" if rolling is not None else "insuficientes datos (mín. 7)"
+            profile = [(day, avg) for day, avg in zip(WEEKDAYS, report["weekday_profile"]) if avg is not None]
+            best_day, best_avg = max(profile, key=lambda item: item[1])
+            trend = report["trend_per_day"]
+
             detalles += (
                 f"📊 {metric}:\n"
-                f"  - Número de datos analizados: {n}\n"
+                f"  - Número de datos analizados: {report['n']}\n"
                 f"  - Media: {media:.2f}\n"
-                f"  - Mínimo: {minimum}\n"
-                f"  - Máximo: {maximum}\n"
-                f"  - Desviación Estándar: {std_dev:.2f}\n"
+                f"  - Mínimo: {report['min']:g}\n"
+                f"  - Máximo: {report['max']:g}\n"
+                f"  - Desviación Estándar: {report['std']:.2f}\n"
+                f"  - Percentiles: {percentiles}\n"
+                f"  - Media móvil (últimos 7 registros): {rolling_text}\n"
+                f"  - Mejor día de la semana: {best_day} (media {best_avg:.2f})\n"
+                f"  - Tendencia: {trend:+.2f} por día\n"
                 f"  - KPI de Performance Estimado: {kpi_performance:.2f}\n"
                 f"  - Interpretación: {interpretation}\n"
                 f"  - Valor óptimo/meta: {optimal}\n\n"
@@ -140,77 +147,77 @@ class ConclusionsWindow(QDialog):
 
         full_report = intro + detalles + conclusions
 
-        print("DEBUG full report:\n", full_report)  # Para verificar que el texto final está OK
-
         self.conclusions_area.setPlainText(full_report)
 
     def export_pdf(self):
         if self.conclusions_area.toPlainText().strip() == "":
             self.conclusions_area.setText("⚠️ Por favor, genera las conclusiones antes de exportar el PDF.")
             return
+        if self.report_thread is not None and self.report_thread.isRunning():
+            return
 
-        pdf = FPDF()
-        pdf.add_page()
-
-        # Título
-        pdf.set_font("Arial", 'B', 16)
-        pdf.set_text_color(47, 79, 79)  # Dark slate gray
-        pdf.cell(0, 10, "Reporte de Conclusiones Estadísticas", ln=True, align="C")
-        pdf.ln(10)
-
-        # Subtítulo
-        pdf.set_font("Arial", 'B', 12)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 10, "Resumen de KPIs y Recomendaciones", ln=True)
-        pdf.ln(5)
-
-        # Obtener y limpiar texto para PDF
-        raw_text = self.conclusions_area.toPlainText()
-        clean_text = clean_text_for_pdf(raw_text)
-
-        # Parsear texto para mejor formato en PDF
-        lines = clean_text.split('\n')
-
-        pdf.set_font("Courier", size=12)
-        for line in lines:
-            if line.startswith("Estadísticas Generales") or line.startswith("Recomendaciones") or line.startswith("----------------"):
-                # Headers o separadores en negrita
-                pdf.set_font("Courier", 'B', 12)
-            else:
-                pdf.set_font("Courier", size=12)
-            pdf.multi_cell(0, 8, line)
-        pdf.ln(10)
-
-        # Footer con página
-        pdf.set_y(-15)
-        pdf.set_font('Arial', 'I', 8)
-        pdf.set_text_color(128, 128, 128)
-        pdf.cell(0, 10, 'Página %s' % pdf.page_no(), 0, 0, 'C')
-
-        filename = "reporte_estadisticas_profesional.pdf"
-        pdf.output(filename)
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Guardar Reporte PDF", "reporte_estadisticas_profesional.pdf", "PDF (*.pdf)")
+        if not filename:
+            return
 
+        # fpdf is only needed here, so it is not loaded with the tab
+        from .stats_report import compose_report, render_report_charts
+
+        # Charts are painted here (GUI thread); the PDF is composed in the worker
+        self.chart_dir = tempfile.mkdtemp(prefix="stats_report_")
+        try:
+            charts = render_report_charts(self.stats_index, self.chart_dir)
+        except Exception as e:
+            shutil.rmtree(self.chart_dir, ignore_errors=True)
+            self.conclusions_area.append(f"\n❌ No se pudieron generar los gráficos: {e}")
+            return
+
+        self.btn_export_pdf.setEnabled(False)
+        self.progress_bar.setRange(0, len(charts) + 2)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+
+        self.report_thread, self.report_worker = start_worker(
+            compose_report, filename, self.conclusions_area.toPlainText(), charts,
+            on_progress=self.on_report_progress, on_finished=self.on_report_finished,
+            on_error=self.on_report_error, on_done=self.on_report_thread_done)
+
+    def on_report_progress(self, progress):
+        step, total, message = progress
+        self.progress_bar.setValue(step)
+        self.progress_bar.setFormat(f"{message} (%v/%m)")
+
+    def on_report_finished(self, filename):
         self.conclusions_area.append("\n✅ Reporte PDF generado con éxito como:\n" + filename)
 
+    def on_report_error(self, message):
+        self.conclusions_area.append(f"\n❌ Error al generar el PDF: {message}")
+
+    def on_report_thread_done(self):
+        shutil.rmtree(self.chart_dir, ignore_errors=True)
+        self.progress_bar.setVisible(False)
+        self.btn_export_pdf.setEnabled(True)
+
+    def done(self, result):
+        # The report thread must finish before the dialog (its parent) is destroyed
+        stop_thread(self.report_thread)
+        super().done(result)
+
 class StatsGraphWindow(QDialog):
-    def __init__(self, stats_dict, parent=None):
+    def __init__(self, stats_index, parent=None, user_totals=None):
+        """'user_totals' ({user: {metric: total}}) switches to team mode with a per-user breakdown."""
         super().__init__(parent)
-        self.setWindowTitle("Graphical Statistics (Latest Entry Summary)")
-        self.resize(1200, 700)
+        self.setWindowTitle("Team Statistics" if user_totals else "Graphical Statistics (Latest Entry Summary)")
+        self.resize(1600 if user_totals else 1200, 700)
 
         layout = QHBoxLayout(self)
 
         # Get the latest date
-        if not stats_dict:
+        if not len(stats_index):
             return
-        last_date = max(stats_dict.keys())
-        cumulative = {}
-        for date, daily in stats_dict.items():
-            for stat, val in daily.items():
-                try:
-                    cumulative[stat] = cumulative.get(stat, 0) + float(val)
-                except ValueError:
-                    continue
+        last_date = stats_index.last_day().isoformat()
+        cumulative = stats_index.totals()
 
         # PIE CHART
         self.pie_series = QPieSeries()
@@ -266,6 +273,39 @@ class StatsGraphWindow(QDialog):
         bar_view.setRenderHint(QPainter.Antialiasing)
         layout.addWidget(bar_view)
 
+        if user_totals:
+            layout.addWidget(self.user_breakdown_view(user_totals, categories))
+
+    def user_breakdown_view(self, user_totals, metrics):
+        """Stacked bars: one bar per user, one segment per metric."""
+        users = sorted(user_totals)
+        series = QStackedBarSeries()
+        for metric in metrics:
+            bar_set = QBarSet(metric)
+            bar_set.append([user_totals[user].get(metric, 0) for user in users])
+            series.append(bar_set)
+
+        chart = QChart()
+        chart.addSeries(series)
+        chart.setTitle(f"Per-User Breakdown ({len(users)} users)")
+
+        axis_x = QBarCategoryAxis()
+        axis_x.append(users)
+        axis_x.setLabelsAngle(-90)
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        series.attachAxis(axis_x)
+
+        axis_y = QValueAxis()
+        highest = max((sum(user_totals[user].values()) for user in users), default=0)
+        axis_y.setRange(0, highest * 1.1 if highest else 10)
+        chart.addAxis(axis_y, Qt.AlignLeft)
+        series.attachAxis(axis_y)
+
+        chart.legend().setAlignment(Qt.AlignBottom)
+        view = QChartView(chart)
+        view.setRenderHint(QPainter.Antialiasing)
+        return view
+
     def on_hover_slice(self, state):
         slice = self.sender()
         if not isinstance(slice, QPieSlice):
@@ -280,12 +320,16 @@ class StatsGraphWindow(QDialog):
 
 
 class ProgressGraphWindow(QDialog):
-    def __init__(self, stats_data, stats_keys, parent=None):
+    # UI unit -> StatsStore rollup period
+    UNIT_PERIODS = {"Days": "day", "Weeks": "week", "Months": "month"}
+
+    def __init__(self, store, stats_index, stats_keys, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Progress Over Time")
         self.resize(1000, 600)
 
-        self.stats_data = stats_data  # dict date_str -> {stat: value}
+        self.store = store  # StatsStore with the day/week/month rollups
+        self.stats_index = stats_index
         self.stats_keys = stats_keys
 
         self.current_unit = "Weeks"  # default unit
@@ -334,32 +378,46 @@ class ProgressGraphWindow(QDialog):
 
         main_layout.addLayout(controls_layout)
 
+        # Chart, series and axes are created once and updated by update_chart
+        self.chart = QChart()
+        self.bar_set = QBarSet("Total")
+        self.bar_set.append([0] * len(self.stats_keys))
+        self.bar_series = QBarSeries()
+        self.bar_series.append(self.bar_set)
+        self.chart.addSeries(self.bar_series)
+
+        self.axis_x = QBarCategoryAxis()
+        self.axis_x.append(self.stats_keys)
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.bar_series.attachAxis(self.axis_x)
+
+        self.axis_y = QValueAxis()
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.bar_series.attachAxis(self.axis_y)
+
+        self.chart.legend().setVisible(False)
+
         # Chart view
-        self.chart_view = QChartView()
+        self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.Antialiasing)
         main_layout.addWidget(self.chart_view)
 
         self.setLayout(main_layout)
 
         # Initialize period start to earliest date in data or today
-        if self.stats_data:
-            all_dates = sorted(datetime.strptime(d, "%Y-%m-%d").date() for d in self.stats_data.keys())
-            self.current_period_start = all_dates[0]
-        else:
-            self.current_period_start = date.today()
+        self.current_period_start = self.stats_index.first_day() or date.today()
 
         self.update_chart()
 
     def change_unit(self, unit):
         self.current_unit = unit
         # Reset current period start to earliest date or today on unit change
-        if self.stats_data:
-            all_dates = sorted(datetime.strptime(d, "%Y-%m-%d").date() for d in self.stats_data.keys())
-            self.current_period_start = all_dates[0]
-        else:
-            self.current_period_start = date.today()
-        self.update_chart()
+        self.current_period_start = self.stats_index.first_day() or date.today()
+        # Keep the combo in sync without re-entering change_unit (and redrawing twice)
+        self.unit_combo.blockSignals(True)
         self.unit_combo.setCurrentText(unit)
+        self.unit_combo.blockSignals(False)
+        self.update_chart()
 
     def go_prev(self):
         if self.current_unit == "Days":
@@ -410,63 +468,170 @@ class ProgressGraphWindow(QDialog):
 
         self.period_label.setText(period_label)
 
-        # Aggregate data only within this period
-        for date_str, stats in self.stats_data.items():
-            try:
-                dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-            except:
-                continue
-            if start <= dt <= end:
-                for stat in self.stats_keys:
-                    try:
-                        val = float(stats.get(stat, 0))
-                    except:
-                        val = 0
-                    aggregation[stat] += val
-
-        # Now build chart with this aggregation (1 bar per stat, or line with 1 point per stat)
-        chart = QChart()
-        chart.setTitle(f"Progress: {period_label}")
+        # Period totals come precomputed from the rollup table
+        totals = self.store.period_totals(self.UNIT_PERIODS[self.current_unit], start)
+        for stat in self.stats_keys:
+            aggregation[stat] = totals.get(stat, 0)
+
+        # Update the existing bars and axis in place; the chart objects are built once in init_ui
+        values = [aggregation[stat] for stat in self.stats_keys]
+        for i, value in enumerate(values):
+            self.bar_set.replace(i, value)
+        self.axis_y.setRange(0, max(values) * 1.2 if any(values) else 10)
+        self.chart.setTitle(f"Progress: {period_label}")
+
+
+class ZoomableChartView(QChartView):
+    """Rubber-band zoom, mouse-wheel zoom and arrow-key panning."""
+
+    def __init__(self, chart, parent=None):
+        super().__init__(chart, parent)
+        self.setRubberBand(QChartView.HorizontalRubberBand)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def wheelEvent(self, event):
+        self.chart().zoom(1.25 if event.angleDelta().y() > 0 else 0.8)
+
+    def keyPressEvent(self, event):
+        step = self.chart().plotArea().width() / 10
+        if event.key() == Qt.Key_Left:
+            self.chart().scroll(-step, 0)
+        elif event.key() == Qt.Key_Right:
+            self.chart().scroll(step, 0)
+        elif event.key() == Qt.Key_Escape:
+            self.chart().zoomReset()
+        else:
+            super().keyPressEvent(event)
 
-        bar_set = QBarSet("Total")
-        categories = []
-        values = []
 
-        for stat, val in aggregation.items():
-            categories.append(stat)
-            values.append(val)
+class TimeSeriesWindow(QDialog):
+    """
+    Daily values of every metric as lines over any date range. Only about one
+    point per horizontal pixel is drawn: the visible part of each series is
+    downsampled with LTTB, and again whenever the view is zoomed or panned.
+    """
 
-        bar_set.append(values)
-        bar_series = QBarSeries()
-        bar_series.append(bar_set)
-        chart.addSeries(bar_series)
+    def __init__(self, stats_index, stats_keys, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trend Over Time")
+        self.resize(1100, 600)
 
-        axis_x = QBarCategoryAxis()
-        axis_x.append(categories)
-        chart.addAxis(axis_x, Qt.AlignBottom)
-        bar_series.attachAxis(axis_x)
+        self.stats_index = stats_index
+        self.stats_keys = stats_keys
+        self.data = {}  # metric -> (x in ms since epoch, values) of the selected range
 
-        axis_y = QValueAxis()
-        axis_y.setRange(0, max(values)*1.2 if values else 10)
-        chart.addAxis(axis_y, Qt.AlignLeft)
-        bar_series.attachAxis(axis_y)
+        layout = QVBoxLayout(self)
 
-        chart.legend().setVisible(False)
+        controls = QHBoxLayout()
+        first = stats_index.first_day() or date.today()
+        last = stats_index.last_day() or date.today()
+        controls.addWidget(QLabel("From:"))
+        self.start_edit = QDateEdit(QDate(first), calendarPopup=True)
+        controls.addWidget(self.start_edit)
+        controls.addWidget(QLabel("To:"))
+        self.end_edit = QDateEdit(QDate(last), calendarPopup=True)
+        controls.addWidget(self.end_edit)
+        apply_btn = QPushButton("Apply")
+        apply_btn.clicked.connect(self.load_range)
+        controls.addWidget(apply_btn)
+        reset_btn = QPushButton("Reset Zoom")
+        reset_btn.clicked.connect(lambda: self.chart.zoomReset())
+        controls.addWidget(reset_btn)
+        controls.addStretch()
+        controls.addWidget(QLabel("Drag to zoom · wheel to zoom · ←/→ to pan"))
+        layout.addLayout(controls)
+
+        self.chart = QChart()
+        self.chart.legend().setAlignment(Qt.AlignBottom)
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setFormat("yyyy-MM-dd")
+        self.axis_y = QValueAxis()
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+
+        self.series = {}
+        for metric in stats_keys:
+            series = QLineSeries()
+            series.setName(metric)
+            self.chart.addSeries(series)
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
+            self.series[metric] = series
+
+        self.chart_view = ZoomableChartView(self.chart)
+        layout.addWidget(self.chart_view)
+
+        # Zooming fires several range changes in a row; resample once they settle
+        self.resample_timer = QTimer(self)
+        self.resample_timer.setSingleShot(True)
+        self.resample_timer.setInterval(30)
+        self.resample_timer.timeout.connect(self.resample)
+        self.axis_x.rangeChanged.connect(lambda *_: self.resample_timer.start())
+
+        self.load_range()
+
+    def load_range(self):
+        start = self.start_edit.date().toPyDate()
+        end = self.end_edit.date().toPyDate()
+        self.data = {}
+        highest = 0
+        for metric in self.stats_keys:
+            dates, values = self.stats_index.series(metric, start, end)
+            xs = [datetime.combine(d, time()).timestamp() * 1000 for d in dates]
+            self.data[metric] = (xs, values)
+            highest = max([highest] + values)
+
+        self.axis_y.setRange(0, highest * 1.1 if highest else 10)
+        self.chart.zoomReset()
+        self.axis_x.setRange(QDateTime(QDate(start)), QDateTime(QDate(end)))
+        self.resample()
+
+    def resample(self):
+        """Redraws each series from the points inside the visible x range."""
+        lo = self.axis_x.min().toMSecsSinceEpoch()
+        hi = self.axis_x.max().toMSecsSinceEpoch()
+        pixels = max(int(self.chart.plotArea().width()), 100)
+        for metric, (xs, values) in self.data.items():
+            # One point beyond each edge so the line reaches the border
+            first = max(bisect_left(xs, lo) - 1, 0)
+            last = min(bisect_right(xs, hi) + 1, len(xs))
+            sample_x, sample_y = lttb(xs[first:last], values[first:last], pixels)
+            self.series[metric].replace([QPointF(x, y) for x, y in zip(sample_x, sample_y)])
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resample_timer.start()
 
-        self.chart_view.setChart(chart)
 
 class StatisticsTab(QWidget):
     output_message = pyqtSignal(str)
+    # Emitted from the event aggregator thread, delivered on the GUI thread
+    events_folded = pyqtSignal(dict)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.stats_keys = ["Template Leads", "Email-Sent", "Contacts", "Metabase"]
-        self.stats_data = {}  # dict date_str -> {stat: value}
+        self.store = StatsStore()
+        self._stats_index = None  # built on first use, then kept in sync on save
+        self.team_store = None  # opened when the team view is first used
+        self.team_thread = None
+        self.export_thread = None
         self.current_date = date.today()
         self.init_ui()
-        self.load_data()
         self.update_ui_for_date(self.current_date)
-        self.stats_file = "other/stats_progress.json"
+        self.events_folded.connect(self.on_events_folded)
+        # Removed again before the widget goes away: the recorder's last fold runs at exit
+        self.fold_listener = self.events_folded.emit
+        get_recorder().add_listener(self.fold_listener)
+        self.destroyed.connect(functools.partial(get_recorder().remove_listener, self.fold_listener))
+        # output_message is connected once the tab is built, so report on the next loop turn
+        QTimer.singleShot(0, self.report_store_warnings)
+
+    def report_store_warnings(self):
+        for warning in self.store.warnings:
+            self.output_message.emit(f"[StatisticsTab] {warning}\n")
+        self.store.warnings.clear()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -510,6 +675,18 @@ class StatisticsTab(QWidget):
         self.show_progress_btn.clicked.connect(self.show_progress)
         btn_layout.addWidget(self.show_progress_btn)
 
+        self.show_trend_btn = QPushButton("📉 Show Trend")
+        self.show_trend_btn.clicked.connect(self.show_trend)
+        btn_layout.addWidget(self.show_trend_btn)
+
+        self.export_btn = QPushButton("📤 Export Data")
+        self.export_btn.clicked.connect(self.export_data)
+        btn_layout.addWidget(self.export_btn)
+
+        self.team_btn = QPushButton("👥 Team Stats")
+        self.team_btn.clicked.connect(self.show_team_stats)
+        btn_layout.addWidget(self.team_btn)
+
         # Botón para generar conclusiones
         self.btn_generate = QPushButton("🎯 Conclusiones")
         self.btn_generate.clicked.connect(self.open_conclusions_window)
@@ -517,28 +694,36 @@ class StatisticsTab(QWidget):
 
         layout.addLayout(btn_layout)
 
+    @property
+    def stats_index(self):
+        """Date-sorted columnar index shared by the chart and conclusion windows."""
+        if self._stats_index is None:
+            self._stats_index = StatsIndex.from_store(self.store)
+        return self._stats_index
+
     def open_conclusions_window(self):
-        dialog = ConclusionsWindow(self.stats_data, self)
+        dialog = ConclusionsWindow(self.stats_index, self)
         dialog.exec_()
 
     def delete_stats(self):
-        if not os.path.exists(self.stats_file):
-            QMessageBox.information(self, "No File", "Stats file does not exist.")
+        if self.store.is_empty():
+            QMessageBox.information(self, "No Data", "There are no saved statistics.")
             return
 
         confirm = QMessageBox.question(
             self,
-            "Delete File?",
-            f"Are you sure you want to delete '{self.stats_file}'?",
+            "Delete Stats?",
+            f"Are you sure you want to delete all statistics saved in '{self.store.db_path}'?",
             QMessageBox.Yes | QMessageBox.No,
         )
         if confirm == QMessageBox.Yes:
             try:
-                os.remove(self.stats_file)
-                self.stats_data.clear()
-                QMessageBox.information(self, "Deleted", "Stats file deleted successfully.")
+                self.store.clear()
+                self._stats_index = None
+                self.update_ui_for_date(self.current_date)
+                QMessageBox.information(self, "Deleted", "Statistics deleted successfully.")
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not delete file: {e}")
+                QMessageBox.critical(self, "Error", f"Could not delete statistics: {e}")
 
 
     def on_date_changed(self, qdate):
@@ -547,12 +732,15 @@ class StatisticsTab(QWidget):
         self.update_ui_for_date(py_date)
         self.output_message.emit(f"[StatisticsTab] Date changed to {py_date}\n")
 
-    def update_ui_for_date(self, dt):
+    def update_ui_for_date(self, dt, keep_edits=False):
+        """Fills the form from the store; with keep_edits, fields the user has typed into are left alone."""
         date_str = dt.isoformat()
-        stats_for_date = self.stats_data.get(date_str, {})
+        stats_for_date = self.store.get_day(date_str)
         for stat in self.stats_keys:
+            if keep_edits and self.inputs[stat].isModified():
+                continue
             val = stats_for_date.get(stat, "")
-            self.inputs[stat].setText(str(val))
+            self.inputs[stat].setText(str(val))  # also clears the modified flag
 
     def save_current_entry(self):
         date_str = self.current_date.isoformat()
@@ -568,39 +756,108 @@ class StatisticsTab(QWidget):
                 return
             entry[stat] = val
 
-        self.stats_data[date_str] = entry
-        self.save_data()
+        self.save_data(date_str, entry)
+        for le in self.inputs.values():
+            le.setModified(False)  # saved: automatic counters may refresh them again
         self.output_message.emit(f"[StatisticsTab] Saved stats for {date_str}: {entry}\n")
 
+    def on_events_folded(self, counts):
+        """Refreshes the index and the form after automatic counters were saved."""
+        by_day = {}
+        for (day, metric), delta in counts.items():
+            by_day.setdefault(day, {})[metric] = delta
+        if self._stats_index is not None:
+            for day, deltas in by_day.items():
+                self._stats_index.add_to_day(day, deltas)
+        if self.current_date.isoformat() in by_day:
+            # Unsaved edits win over the automatic counters until they are saved
+            self.update_ui_for_date(self.current_date, keep_edits=True)
+
     def show_chart(self):
-        self.output_message.emit(f"[StatisticsTab] Showing full graph from data: {self.stats_data}\n")
-        graph_window = StatsGraphWindow(self.stats_data, self)
+        self.output_message.emit("[StatisticsTab] Showing full graph.\n")
+        graph_window = StatsGraphWindow(self.stats_index, self)
         graph_window.exec_()
 
 
     def show_progress(self):
         # Open the progress over time window
-        progress_window = ProgressGraphWindow(self.stats_data, self.stats_keys, self)
+        progress_window = ProgressGraphWindow(self.store, self.stats_index, self.stats_keys, self)
         progress_window.exec_()
 
-    def save_data(self):
+    def show_trend(self):
+        self.output_message.emit("[StatisticsTab] Showing trend over time.\n")
+        trend_window = TimeSeriesWindow(self.stats_index, self.stats_keys, self)
+        trend_window.exec_()
+
+    def export_data(self):
+        """Exports the stats and rollups (Parquet with pyarrow, CSV otherwise) on a worker thread."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Export Folder")
+        if not folder:
+            return
+
+        self.export_btn.setEnabled(False)
+        self.output_message.emit(f"[StatisticsTab] Exporting statistics as {default_format()} to {folder}...\n")
+        self.export_thread, self.export_worker = start_worker(
+            export_stats, folder, self.store.db_path,
+            on_finished=self.on_export_finished, on_error=self.on_export_error)
+
+    def on_export_finished(self, written):
+        self.export_btn.setEnabled(True)
+        for path, rows in written.items():
+            self.output_message.emit(f"[StatisticsTab] Exported {rows} rows to {path}\n")
+
+    def on_export_error(self, message):
+        self.export_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not export statistics: {message}")
+
+    def show_team_stats(self):
+        """Imports a folder of intern stats files into the team database, then shows the team charts."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder with Intern Stats Files")
+        if self.team_store is None:
+            self.team_store = TeamStore()
+        if not folder:
+            if not self.team_store.is_empty():
+                self.open_team_window()
+            return
+
+        self.team_btn.setEnabled(False)
+        self.output_message.emit(f"[StatisticsTab] Importing team stats from {folder}...\n")
+        self.team_thread, self.team_worker = start_worker(
+            self.team_store.import_paths, [folder],
+            on_finished=self.on_team_import_finished, on_error=self.on_team_import_error)
+
+    def on_team_import_finished(self, imported):
+        self.team_btn.setEnabled(True)
+        rows = sum(imported.values())
+        self.output_message.emit(f"[StatisticsTab] Imported {rows} rows for {len(imported)} users.\n")
+        if self.team_store.is_empty():
+            QMessageBox.information(self, "No Data", "No statistics files were found in that folder.")
+            return
+        self.open_team_window()
+
+    def on_team_import_error(self, message):
+        self.team_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not import team statistics: {message}")
+
+    def open_team_window(self):
+        team_window = StatsGraphWindow(self.team_store.team_index(), self,
+                                       user_totals=self.team_store.user_totals())
+        team_window.exec_()
+
+    def reset_process(self):
+        """Called by MainWindow on close: a running import or export must finish before its QThread is destroyed."""
+        get_recorder().remove_listener(self.fold_listener)
+        stop_thread(self.team_thread)
+        stop_thread(self.export_thread)
+
+    def save_data(self, date_str, entry):
         try:
-            with open(DATA_FILE, "w") as f:
-                json.dump(self.stats_data, f, indent=2)
+            self.store.upsert_day(date_str, entry)
+            if self._stats_index is not None:
+                self._stats_index.set_day(date_str, entry)
         except Exception as e:
             self.output_message.emit(f"[StatisticsTab] Error saving data: {e}\n")
 
-    def load_data(self):
-        if DATA_FILE.exists():
-            try:
-                with open(DATA_FILE, "r") as f:
-                    self.stats_data = json.load(f)
-            except Exception as e:
-                self.output_message.emit(f"[StatisticsTab] Error loading data: {e}\n")
-                self.stats_data = {}
-        else:
-            self.stats_data = {}
-
 
 class TestMainWindow(QMainWindow):
     def __init__(self):
@@ -0,0 +1,155 @@
+# modules/stats_engine.py
+
+"""
+Descriptive statistics for the Conclusions window, computed from the
+columns of a StatsIndex. Uses NumPy when it is installed; otherwise falls
+back to one-pass (Welford) mean/variance and pure-Python helpers that give
+the same results. Also holds the LTTB downsampling used by the
+time-series chart.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PERCENTILES = (25, 50, 75, 90)
+WEEKDAYS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+
+def welford(values):
+    """One pass over the values: (n, mean, population variance, min, max)."""
+    n, mean, m2 = 0, 0.0, 0.0
+    minimum = maximum = None
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        if minimum is None or x < minimum:
+            minimum = x
+        if maximum is None or x > maximum:
+            maximum = x
+    return n, mean, (m2 / n if n else 0.0), minimum, maximum
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (same method as numpy.percentile's default)."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def summarize(values):
+    """n, mean, std, min, max and the PERCENTILES of a list of numbers."""
+    if np is not None and len(values):
+        arr = np.asarray(values, dtype=float)
+        summary = {"n": int(arr.size), "mean": float(arr.mean()), "std": float(arr.std()),
+                   "min": float(arr.min()), "max": float(arr.max())}
+        for q, value in zip(PERCENTILES, np.percentile(arr, PERCENTILES)):
+            summary[f"p{q}"] = float(value)
+        return summary
+    n, mean, variance, minimum, maximum = welford(values)
+    summary = {"n": n, "mean": mean, "std": variance ** 0.5,
+               "min": minimum if n else 0.0, "max": maximum if n else 0.0}
+    ordered = sorted(values)
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(ordered, q)
+    return summary
+
+
+def rolling_mean(values, window=7):
+    """Mean of each run of 'window' consecutive values (empty if there are fewer values)."""
+    if len(values) < window:
+        return []
+    if np is not None:
+        cumsum = np.cumsum(np.insert(np.asarray(values, dtype=float), 0, 0.0))
+        return ((cumsum[window:] - cumsum[:-window]) / window).tolist()
+    result, running = [], sum(values[:window])
+    result.append(running / window)
+    for i in range(window, len(values)):
+        running += values[i] - values[i - window]
+        result.append(running / window)
+    return result
+
+
+def weekday_profile(dates, values):
+    """Average value per weekday (Monday first); None for weekdays without data."""
+    if np is not None and len(values):
+        weekdays = np.fromiter((d.weekday() for d in dates), dtype=int, count=len(dates))
+        sums = np.bincount(weekdays, weights=np.asarray(values, dtype=float), minlength=7)
+        counts = np.bincount(weekdays, minlength=7)
+        return [float(s / c) if c else None for s, c in zip(sums, counts)]
+    sums, counts = [0.0] * 7, [0] * 7
+    for d, v in zip(dates, values):
+        sums[d.weekday()] += v
+        counts[d.weekday()] += 1
+    return [s / c if c else None for s, c in zip(sums, counts)]
+
+
+def trend_slope(dates, values):
+    """Least-squares slope of value over time, in units per day (0 with fewer than 2 days)."""
+    if len(values) < 2:
+        return 0.0
+    if np is not None:
+        x = np.fromiter((d.toordinal() for d in dates), dtype=float, count=len(dates))
+        y = np.asarray(values, dtype=float)
+        x -= x.mean()
+        denominator = float((x * x).sum())
+        return float((x * (y - y.mean())).sum() / denominator) if denominator else 0.0
+    xs = [d.toordinal() for d in dates]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(values) / len(values)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator if denominator else 0.0
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps 'threshold' points
+    (first and last included) that preserve the visual shape of the line.
+    Returns the selected (xs, ys); short inputs are returned unchanged.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    sampled = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(best)
+        a = best
+    sampled.append(n - 1)
+    return [xs[i] for i in sampled], [ys[i] for i in sampled]
+
+
+def metric_report(stats_index, metric, window=7):
+    """All of the above for one metric of a StatsIndex."""
+    dates, values = stats_index.series(metric)
+    report = summarize(values)
+    rolling = rolling_mean(values, window)
+    report["rolling_mean"] = rolling[-1] if rolling else None
+    report["weekday_profile"] = weekday_profile(dates, values)
+    report["trend_per_day"] = trend_slope(dates, values)
+    return report
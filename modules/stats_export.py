@@ -0,0 +1,128 @@
+# modules/stats_export.py
+
+"""
+Export of the statistics database for analysis outside the app.
+
+Writes two files, one for the per-day values and one for the day/week/month
+rollups. The columns are typed: dates are real dates, values are float64,
+and nothing is a formatted string. Parquet is used when pyarrow is
+installed (imported on first export) and CSV otherwise. Rows are read from SQLite in batches and
+written as they arrive, so years of data never sit in memory at once.
+"""
+
+import csv
+import importlib.util
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+from .stats_store import DB_FILE
+
+BATCH_SIZE = 10000
+
+# name -> (query, [(column, arrow type name)])
+TABLES = {
+    "stats": (
+        "SELECT day, metric, value FROM stats ORDER BY day, metric",
+        [("day", "date32"), ("metric", "string"), ("value", "float64")],
+    ),
+    "rollups": (
+        "SELECT period, bucket, bucket, metric, total FROM rollups ORDER BY period, bucket, metric",
+        [("period", "string"), ("bucket", "string"), ("period_start", "date32"),
+         ("metric", "string"), ("total", "float64")],
+    ),
+}
+
+
+def has_pyarrow():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def default_format():
+    return "parquet" if has_pyarrow() else "csv"
+
+
+def bucket_start(bucket):
+    """First day of a rollup bucket: '2025-06-18', '2025-W25' (ISO week) or '2025-06'."""
+    if "-W" in bucket:
+        year, week = bucket.split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    if len(bucket) == 7:
+        return date.fromisoformat(bucket + "-01")
+    return date.fromisoformat(bucket)
+
+
+def iter_batches(db_path, query, batch_size=BATCH_SIZE):
+    """Yields lists of rows from a private read connection (a consistent snapshot of the database)."""
+    conn = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(query)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        conn.close()
+
+
+def typed_columns(rows, columns):
+    """Transposes a batch of rows into one list per column, parsing the date columns."""
+    data = {}
+    for i, (name, kind) in enumerate(columns):
+        values = [row[i] for row in rows]
+        if kind == "date32":
+            values = [bucket_start(v) if name == "period_start" else date.fromisoformat(v) for v in values]
+        data[name] = values
+    return data
+
+
+def write_parquet(path, batches, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+    rows_written = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for rows in batches:
+            writer.write_table(pa.Table.from_pydict(typed_columns(rows, columns), schema=schema))
+            rows_written += len(rows)
+    return rows_written
+
+
+def write_csv(path, batches, columns):
+    rows_written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in columns])
+        for rows in batches:
+            data = typed_columns(rows, columns)
+            writer.writerows(zip(*(
+                [v.isoformat() for v in data[name]] if kind == "date32" else data[name]
+                for name, kind in columns
+            )))
+            rows_written += len(rows)
+    return rows_written
+
+
+def export_stats(out_dir, db_path=DB_FILE, fmt=None, batch_size=BATCH_SIZE):
+    """
+    Writes stats.<fmt> and rollups.<fmt> to out_dir. 'fmt' is "parquet"
+    (needs pyarrow) or "csv"; by default Parquet when available.
+    Generator for Worker: yields (done, total, file) and returns
+    {file path: rows written}.
+    """
+    fmt = fmt or default_format()
+    if fmt == "parquet" and not has_pyarrow():
+        raise RuntimeError("Parquet export needs pyarrow. Install it with 'pip install pyarrow' or export to CSV.")
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    write = write_parquet if fmt == "parquet" else write_csv
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for done, (name, (query, columns)) in enumerate(TABLES.items(), start=1):
+        path = out_dir / f"{name}.{fmt}"
+        written[str(path)] = write(path, iter_batches(db_path, query, batch_size), columns)
+        yield (done, len(TABLES), str(path))
+    return written
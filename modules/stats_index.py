@@ -0,0 +1,110 @@
+# modules/stats_index.py
+
+"""
+Columnar, date-sorted view of the statistics shared by the chart and
+conclusion windows. Dates are kept parsed in one sorted list with a
+parallel value list per metric, so any period is found with bisect in
+O(log n) and read as a contiguous slice instead of re-scanning every entry.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+def _as_date(day):
+    return date.fromisoformat(day) if isinstance(day, str) else day
+
+
+class StatsIndex:
+    def __init__(self):
+        self.dates = []     # sorted datetime.date objects
+        self.columns = {}   # metric -> list of float or None (no value that day)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the index from (day, metric, value) rows sorted by day."""
+        index = cls()
+        for day, metric, value in rows:
+            day = _as_date(day)
+            if not index.dates or index.dates[-1] != day:
+                index.dates.append(day)
+                for column in index.columns.values():
+                    column.append(None)
+            column = index.columns.get(metric)
+            if column is None:
+                column = index.columns[metric] = [None] * len(index.dates)
+            column[-1] = float(value)
+        return index
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.from_rows(store.iter_rows())
+
+    @classmethod
+    def from_dict(cls, stats_data):
+        rows = []
+        for day in sorted(stats_data):
+            for metric, value in stats_data[day].items():
+                try:
+                    rows.append((day, metric, float(value)))
+                except (ValueError, TypeError):
+                    continue
+        return cls.from_rows(rows)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def metrics(self):
+        return list(self.columns)
+
+    def set_day(self, day, entry):
+        """Inserts or replaces the values of one day ({metric: value})."""
+        day = _as_date(day)
+        pos = bisect_left(self.dates, day)
+        if pos == len(self.dates) or self.dates[pos] != day:
+            self.dates.insert(pos, day)
+            for column in self.columns.values():
+                column.insert(pos, None)
+        for metric, value in entry.items():
+            column = self.columns.get(metric)
+            if column is None:
+                column = self.columns[metric] = [None] * len(self.dates)
+            column[pos] = float(value)
+
+    def add_to_day(self, day, deltas):
+        """Adds {metric: delta} to the values of one day."""
+        day = _as_date(day)
+        pos = bisect_left(self.dates, day)
+        current = {}
+        if pos < len(self.dates) and self.dates[pos] == day:
+            current = {metric: column[pos] for metric, column in self.columns.items()
+                       if column[pos] is not None}
+        self.set_day(day, {metric: current.get(metric, 0.0) + delta for metric, delta in deltas.items()})
+
+    def slice_bounds(self, start=None, end=None):
+        """Index range [lo, hi) of the dates with start <= date <= end."""
+        lo = 0 if start is None else bisect_left(self.dates, _as_date(start))
+        hi = len(self.dates) if end is None else bisect_right(self.dates, _as_date(end))
+        return lo, hi
+
+    def values(self, metric, start=None, end=None):
+        """Values of one metric inside the range, skipping days without a value."""
+        lo, hi = self.slice_bounds(start, end)
+        return [v for v in self.columns.get(metric, [])[lo:hi] if v is not None]
+
+    def series(self, metric, start=None, end=None):
+        """(dates, values) of one metric inside the range, skipping days without a value."""
+        lo, hi = self.slice_bounds(start, end)
+        pairs = [(d, v) for d, v in zip(self.dates[lo:hi], self.columns.get(metric, [])[lo:hi])
+                 if v is not None]
+        return [d for d, _ in pairs], [v for _, v in pairs]
+
+    def totals(self, start=None, end=None):
+        """Sum per metric inside the range."""
+        return {metric: sum(self.values(metric, start, end)) for metric in self.columns}
+
+    def first_day(self):
+        return self.dates[0] if self.dates else None
+
+    def last_day(self):
+        return self.dates[-1] if self.dates else None
@@ -0,0 +1,212 @@
+# modules/stats_report.py
+
+"""
+Multi-page PDF report for the Statistics tab.
+
+QtCharts can only be painted on the GUI thread, so render_report_charts
+grabs the pie, bar and progress charts into PNG files offscreen (a few
+milliseconds each). Composing the pages and writing the PDF is the slow
+part: compose_report is a generator meant to run in a Worker thread,
+yielding (step, total, message) as it goes.
+"""
+
+import os
+import re
+from calendar import monthrange
+
+from fpdf import FPDF
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+from PyQt5.QtChart import (
+    QChartView, QChart, QPieSeries,
+    QBarSet, QBarSeries, QBarCategoryAxis, QValueAxis
+)
+
+REPORT_TITLE = "Reporte de Conclusiones Estadísticas"
+REPORT_SUBTITLE = "Resumen de KPIs y Recomendaciones"
+CHART_SIZE = (1000, 600)
+PROGRESS_MONTHS = 6
+
+# (regular, bold) TrueType files with accents and symbols; the first one found is embedded
+UNICODE_FONTS = [
+    ("resources/fonts/DejaVuSans.ttf", "resources/fonts/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", None),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+]
+
+HEADER_PREFIXES = ("Estadísticas Generales", "Recomendaciones", "----------------")
+
+
+def find_unicode_font():
+    """(regular, bold) paths of the first available Unicode font, or None."""
+    for regular, bold in UNICODE_FONTS:
+        if os.path.exists(regular):
+            return regular, (bold if bold and os.path.exists(bold) else regular)
+    return None
+
+
+def pdf_text(text, unicode_font):
+    """Drops what the selected font cannot draw (emoji; everything outside Latin-1 for core fonts)."""
+    if unicode_font:
+        return re.sub(r'[^\u0000-\uFFFF]|\uFE0F', '', text)
+    return text.encode("latin-1", "ignore").decode("latin-1")
+
+
+class ReportPDF(FPDF):
+    """FPDF with a Unicode font when one is installed and a page-number footer on every page."""
+
+    def __init__(self):
+        super().__init__()
+        self.unicode_font = False
+        self.report_font = "Arial"
+        font = find_unicode_font()
+        if font:
+            try:
+                self.add_font("ReportSans", "", font[0], uni=True)
+                self.add_font("ReportSans", "B", font[1], uni=True)
+                self.report_font = "ReportSans"
+                self.unicode_font = True
+            except Exception as e:
+                print(f"[StatsReport] Could not load font {font[0]}: {e}")
+        self.alias_nb_pages()
+        self.set_auto_page_break(True, margin=20)
+
+    def clean(self, value):
+        return pdf_text(value, self.unicode_font)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font(self.report_font, '', 8)
+        self.set_text_color(128, 128, 128)
+        self.cell(0, 10, self.clean(f"Página {self.page_no()}/{{nb}}"), 0, 0, 'C')
+
+
+def compose_report(path, text, charts, title=REPORT_TITLE):
+    """
+    Writes the conclusions text followed by one page per chart.
+    'charts' is a list of (caption, png_path) from render_report_charts.
+    Generator for Worker: yields (step, total, message), returns the path.
+    """
+    total = len(charts) + 2
+    pdf = ReportPDF()
+    pdf.add_page()
+
+    pdf.set_font(pdf.report_font, 'B', 16)
+    pdf.set_text_color(47, 79, 79)  # Dark slate gray
+    pdf.cell(0, 10, pdf.clean(title), ln=True, align="C")
+    pdf.ln(10)
+
+    pdf.set_font(pdf.report_font, 'B', 12)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, pdf.clean(REPORT_SUBTITLE), ln=True)
+    pdf.ln(5)
+
+    for line in text.split('\n'):
+        style = 'B' if line.startswith(HEADER_PREFIXES) else ''
+        pdf.set_font(pdf.report_font, style, 11)
+        pdf.multi_cell(0, 7, pdf.clean(line))
+    yield (1, total, "Texto de conclusiones")
+
+    for step, (caption, image) in enumerate(charts, start=2):
+        pdf.add_page()
+        pdf.set_font(pdf.report_font, 'B', 14)
+        pdf.set_text_color(47, 79, 79)
+        pdf.cell(0, 10, pdf.clean(caption), ln=True, align="C")
+        pdf.ln(5)
+        pdf.image(image, x=10, w=190)
+        yield (step, total, caption)
+
+    pdf.output(path)
+    yield (total, total, "PDF guardado")
+    return path
+
+
+def pie_chart(totals, title):
+    series = QPieSeries()
+    for label, value in totals.items():
+        if value > 0:
+            series.append(label, value).setLabelVisible(True)
+    chart = QChart()
+    chart.addSeries(series)
+    chart.setTitle(title)
+    chart.legend().setAlignment(Qt.AlignBottom)
+    return chart
+
+
+def bar_chart(categories, sets, title):
+    """One bar group per category; 'sets' maps a set name to its values (one per category)."""
+    series = QBarSeries()
+    highest = 0
+    for name, values in sets.items():
+        bar_set = QBarSet(name)
+        bar_set.append(values)
+        series.append(bar_set)
+        highest = max([highest] + list(values))
+
+    chart = QChart()
+    chart.addSeries(series)
+    chart.setTitle(title)
+
+    axis_x = QBarCategoryAxis()
+    axis_x.append(categories)
+    chart.addAxis(axis_x, Qt.AlignBottom)
+    series.attachAxis(axis_x)
+
+    axis_y = QValueAxis()
+    axis_y.setRange(0, highest * 1.2 if highest else 10)
+    chart.addAxis(axis_y, Qt.AlignLeft)
+    series.attachAxis(axis_y)
+
+    chart.legend().setVisible(len(sets) > 1)
+    chart.legend().setAlignment(Qt.AlignBottom)
+    return chart
+
+
+def render_chart(chart, path, size=CHART_SIZE):
+    """Paints a chart into a PNG file without showing it. GUI thread only."""
+    chart.setAnimationOptions(QChart.NoAnimation)
+    view = QChartView(chart)
+    view.setRenderHint(QPainter.Antialiasing)
+    view.resize(*size)
+    if not view.grab().save(path, "PNG"):
+        raise IOError(f"Could not write chart image {path}")
+    return path
+
+
+def month_bounds(day, months_back=0):
+    """First and last date of the month 'months_back' months before 'day'."""
+    index = day.year * 12 + day.month - 1 - months_back
+    start = day.replace(year=index // 12, month=index % 12 + 1, day=1)
+    return start, start.replace(day=monthrange(start.year, start.month)[1])
+
+
+def render_report_charts(stats_index, out_dir, months=PROGRESS_MONTHS):
+    """
+    Renders the totals (pie and bar) and the month-by-month progress of the
+    last 'months' months to PNG files in out_dir. GUI thread only.
+    Returns [(caption, png_path)].
+    """
+    if not len(stats_index):
+        return []
+    last_date = stats_index.last_day()
+    totals = stats_index.totals()
+    metrics = list(totals)
+    charts = []
+
+    path = render_chart(pie_chart(totals, f"Totales hasta {last_date}"), os.path.join(out_dir, "pie.png"))
+    charts.append(("Distribución de totales", path))
+
+    path = render_chart(bar_chart(metrics, {"Total": [totals[m] for m in metrics]},
+                                  f"Totales hasta {last_date}"),
+                        os.path.join(out_dir, "bar.png"))
+    charts.append(("Totales por métrica", path))
+
+    periods = [month_bounds(last_date, back) for back in range(months - 1, -1, -1)]
+    labels = [start.strftime("%Y-%m") for start, _ in periods]
+    monthly = [stats_index.totals(start, end) for start, end in periods]
+    sets = {metric: [month.get(metric, 0.0) for month in monthly] for metric in metrics}
+    path = render_chart(bar_chart(labels, sets, f"Progreso de los últimos {months} meses"),
+                        os.path.join(out_dir, "progress.png"))
+    charts.append(("Progreso mensual", path))
+    return charts
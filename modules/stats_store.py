@@ -0,0 +1,289 @@
+# modules/stats_store.py
+
+"""
+SQLite storage for the Statistics tab. Every (day, metric) pair is one row,
+keyed and indexed by date, so saving an entry is a single upsert and period
+queries only read the rows they need. The old other/stats_progress.json file
+is imported once and left in place; 'migrated_from' in the meta table
+records that it was imported.
+
+Per-day, ISO-week and month totals are kept in a 'rollups' table that is
+updated with the difference on every save, so a period total is one lookup.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+
+DB_FILE = Path("other/stats_progress.db")
+LEGACY_JSON_FILE = Path("other/stats_progress.json")
+
+PERIODS = ("day", "week", "month")
+
+
+def period_key(period, day):
+    """Bucket key of a date: '2025-06-18' (day), '2025-W25' (ISO week) or '2025-06' (month)."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def format_value(value):
+    """Formats a stored number the way it was typed in the UI ("39", not "39.0")."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+class StatsStore:
+    def __init__(self, db_path=DB_FILE, legacy_json=LEGACY_JSON_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.warnings = []  # problems met while opening (bad legacy data), for the UI to report
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # WAL keeps the file consistent if the app is killed in the middle of a save
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema()
+        if legacy_json:
+            self.migrate_json(Path(legacy_json))
+
+    def create_schema(self):
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats (
+                    day    TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    value  REAL NOT NULL,
+                    PRIMARY KEY (day, metric)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    period TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    total  REAL NOT NULL,
+                    PRIMARY KEY (period, bucket, metric)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            has_rollups = self.conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'rollups_built'").fetchone()
+            # Databases that kept one 'batch:<id>' row per applied batch
+            batches = [key[len("batch:"):] for key, in self.conn.execute(
+                "SELECT key FROM meta WHERE key LIKE 'batch:%'")]
+            if batches:
+                self._set_last_batch(max(batches, key=float))
+                self.conn.execute("DELETE FROM meta WHERE key LIKE 'batch:%'")
+        if not has_rollups:
+            # Databases created before the rollups existed
+            self.rebuild_rollups()
+
+    def rebuild_rollups(self):
+        """Recomputes every rollup from the stats rows (rows whose day is not an ISO date are left out)."""
+        with self.lock, self.conn:
+            self._rebuild_rollups()
+
+    def _rebuild_rollups(self):
+        """rebuild_rollups inside the caller's transaction."""
+        totals = {}
+        buckets = {}  # day -> its (period, bucket) pairs, or None if the day is invalid
+        for day, metric, value in self.conn.execute("SELECT day, metric, value FROM stats"):
+            if day not in buckets:
+                try:
+                    buckets[day] = [(period, period_key(period, day)) for period in PERIODS]
+                except (ValueError, TypeError):
+                    buckets[day] = None
+                    self.warnings.append(f"Ignored stats for invalid date {day!r} in the rollups.")
+            if buckets[day] is None:
+                continue
+            for period, bucket in buckets[day]:
+                key = (period, bucket, metric)
+                totals[key] = totals.get(key, 0.0) + value
+        self.conn.execute("DELETE FROM rollups")
+        self.conn.executemany(
+            "INSERT INTO rollups (period, bucket, metric, total) VALUES (?, ?, ?, ?)",
+            [key + (total,) for key, total in totals.items()])
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollups_built', '1')")
+
+    def _apply_rollup_deltas(self, day, deltas):
+        """Adds {metric: delta} of one day to its day, week and month buckets (caller holds the transaction)."""
+        rows = [(period, period_key(period, day), metric, delta)
+                for period in PERIODS for metric, delta in deltas.items() if delta]
+        self.conn.executemany("""
+            INSERT INTO rollups (period, bucket, metric, total) VALUES (?, ?, ?, ?)
+            ON CONFLICT (period, bucket, metric) DO UPDATE SET total = total + excluded.total
+        """, rows)
+
+    def migrate_json(self, json_path):
+        """
+        Imports the legacy JSON file once. The file itself is not touched.
+        An unreadable file is reported in 'warnings' (and tried again on the
+        next open); days that are not ISO dates are skipped.
+        """
+        if not json_path.exists() or self.is_migrated():
+            return
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("expected an object of days")
+        except (OSError, ValueError) as e:  # JSONDecodeError and UnicodeDecodeError are ValueErrors
+            self.warnings.append(f"Could not import {json_path}: {e}")
+            return
+        rows = []
+        skipped = []
+        for day, metrics in data.items():
+            try:
+                date.fromisoformat(day)
+            except ValueError:
+                skipped.append(day)
+                continue
+            if not isinstance(metrics, dict):
+                skipped.append(day)
+                continue
+            for metric, value in metrics.items():
+                try:
+                    rows.append((day, metric, float(value)))
+                except (ValueError, TypeError):
+                    continue
+        with self.lock, self.conn:
+            # The tab and the event recorder each open the database; whichever
+            # comes first migrates, the other finds 'migrated_from' set.
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self._is_migrated():
+                return
+            # Added rather than ignored: counts recorded before the migration go on top
+            self.conn.executemany("""
+                INSERT INTO stats (day, metric, value) VALUES (?, ?, ?)
+                ON CONFLICT (day, metric) DO UPDATE SET value = value + excluded.value
+            """, rows)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (str(json_path),))
+            self._rebuild_rollups()
+        if skipped:
+            self.warnings.append(f"Skipped {len(skipped)} invalid days while importing {json_path}: "
+                                 + ", ".join(map(repr, skipped[:5])) + ("..." if len(skipped) > 5 else ""))
+
+    def is_migrated(self):
+        with self.lock:
+            return self._is_migrated()
+
+    def _is_migrated(self):
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone() is not None
+
+    def upsert_day(self, day, entry):
+        """Saves all metrics of one day ({metric: value}) in a single transaction."""
+        rows = [(day, metric, float(value)) for metric, value in entry.items()]
+        with self.lock, self.conn:
+            old = dict(self.conn.execute(
+                "SELECT metric, value FROM stats WHERE day = ?", (day,)).fetchall())
+            self._apply_rollup_deltas(day, {metric: value - old.get(metric, 0.0)
+                                            for _, metric, value in rows})
+            self.conn.executemany("""
+                INSERT INTO stats (day, metric, value) VALUES (?, ?, ?)
+                ON CONFLICT (day, metric) DO UPDATE SET value = excluded.value
+            """, rows)
+
+    def _set_last_batch(self, batch_id):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_batch', ?)", (batch_id,))
+
+    def last_batch(self):
+        """Id of the last batch applied by add_counts, as a float (0.0 if none)."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_batch'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def add_counts(self, counts, batch_id=None):
+        """
+        Adds {(day, metric): delta} to the stored values and rollups in one
+        transaction. Batch ids (numeric strings) must increase: a batch_id
+        not above the last applied one is ignored, so a batch interrupted
+        after the commit is not counted twice. Returns True if the counts
+        were applied.
+        """
+        with self.lock, self.conn:
+            if batch_id is not None:
+                row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_batch'").fetchone()
+                if row and float(batch_id) <= float(row[0]):
+                    return False
+                self._set_last_batch(batch_id)
+            self.conn.executemany("""
+                INSERT INTO stats (day, metric, value) VALUES (?, ?, ?)
+                ON CONFLICT (day, metric) DO UPDATE SET value = value + excluded.value
+            """, [(day, metric, delta) for (day, metric), delta in counts.items()])
+            by_day = {}
+            for (day, metric), delta in counts.items():
+                by_day.setdefault(day, {})[metric] = delta
+            for day, deltas in by_day.items():
+                self._apply_rollup_deltas(day, deltas)
+        return True
+
+    def get_day(self, day):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT metric, value FROM stats WHERE day = ?", (day,)).fetchall()
+        return {metric: format_value(value) for metric, value in rows}
+
+    def iter_rows(self, start=None, end=None):
+        """Yields (day, metric, value) ordered by day for start <= day <= end (ISO dates, inclusive)."""
+        query = "SELECT day, metric, value FROM stats"
+        params = []
+        if start and end:
+            query += " WHERE day BETWEEN ? AND ?"
+            params = [start, end]
+        elif start:
+            query += " WHERE day >= ?"
+            params = [start]
+        elif end:
+            query += " WHERE day <= ?"
+            params = [end]
+        query += " ORDER BY day"
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return iter(rows)
+
+    def range(self, start=None, end=None):
+        """Returns {day: {metric: value}} for start <= day <= end (ISO dates, inclusive)."""
+        data = {}
+        for day, metric, value in self.iter_rows(start, end):
+            data.setdefault(day, {})[metric] = format_value(value)
+        return data
+
+    def period_totals(self, period, day):
+        """Totals per metric of the day/week/month bucket containing 'day' (one indexed lookup)."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT metric, total FROM rollups WHERE period = ? AND bucket = ?",
+                (period, period_key(period, day))).fetchall()
+        return dict(rows)
+
+    def first_day(self):
+        """Earliest saved date, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT MIN(day) FROM stats").fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def load_all(self):
+        return self.range()
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM stats LIMIT 1").fetchone() is None
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM stats")
+            self.conn.execute("DELETE FROM rollups")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
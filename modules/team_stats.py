@@ -0,0 +1,289 @@
+# modules/team_stats.py
+
+"""
+Team statistics merged from every intern's stats file.
+
+Each intern keeps their own other/stats_progress.json (or the SQLite
+stats_progress.db that replaced it). TeamStore imports any number of those
+files into one database keyed by (user, day, metric), so re-importing a
+file or overlapping exports never count a value twice, and keeps
+day/week/month rollups per user for team totals and per-user breakdowns.
+
+Command line:
+    python -m modules.team_stats import team_exports/ [--user NAME]
+    python -m modules.team_stats summary [--period month --day 2025-06-01]
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from .stats_index import StatsIndex
+from .stats_store import PERIODS, period_key
+
+TEAM_DB_FILE = Path("other/team_stats.db")
+STATS_FILE_PATTERNS = ("*.json", "*.json.migrated", "*.db")
+
+
+def user_for_path(path):
+    """'alice/stats_progress.json' -> 'alice'; 'bob.json' -> 'bob'."""
+    path = Path(path)
+    stem = path.name.split(".")[0]
+    return path.parent.name if stem == "stats_progress" and path.parent.name else stem
+
+
+def is_iso_day(day):
+    try:
+        date.fromisoformat(day)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def read_stats_file(path):
+    """
+    Yields (day, metric, value) from a legacy JSON stats file or a StatsStore
+    database. Rows whose day is not an ISO date are skipped.
+    """
+    path = Path(path)
+    if path.suffix == ".db":
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            for day, metric, value in conn.execute("SELECT day, metric, value FROM stats"):
+                if is_iso_day(day):
+                    yield day, metric, value
+        finally:
+            conn.close()
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for day, metrics in data.items():
+        if not is_iso_day(day) or not isinstance(metrics, dict):
+            continue
+        for metric, value in metrics.items():
+            try:
+                yield day, metric, float(value)
+            except (ValueError, TypeError):
+                continue
+
+
+def find_stats_files(paths):
+    """Expands directories into the stats files they contain."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in STATS_FILE_PATTERNS:
+                yield from sorted(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            yield path
+
+
+class TeamStore:
+    def __init__(self, db_path=TEAM_DB_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS team_stats (
+                    user   TEXT NOT NULL,
+                    day    TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    value  REAL NOT NULL,
+                    PRIMARY KEY (user, day, metric)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS team_rollups (
+                    period TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    user   TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    total  REAL NOT NULL,
+                    PRIMARY KEY (period, bucket, user, metric)
+                ) WITHOUT ROWID
+            """)
+        self.drop_invalid_days()
+
+    def drop_invalid_days(self):
+        """
+        Removes rows whose day is not an ISO date (imported before
+        read_stats_file checked them) and rebuilds the rollups of their users.
+        """
+        with self.lock, self.conn:
+            bad = [(user, day) for user, day in self.conn.execute("SELECT DISTINCT user, day FROM team_stats")
+                   if not is_iso_day(day)]
+            if not bad:
+                return
+            self.conn.executemany("DELETE FROM team_stats WHERE user = ? AND day = ?", bad)
+            for user in {user for user, _ in bad}:
+                self._rebuild_user_rollups(user)
+        print(f"[TeamStats] Dropped rows of {len(bad)} invalid days from {self.db_path}")
+
+    def import_rows(self, user, rows):
+        """Upserts one user's (day, metric, value) rows and rebuilds that user's rollups. Returns the row count."""
+        with self.lock, self.conn:
+            return self._import_rows(user, rows)
+
+    def _import_rows(self, user, rows):
+        rows = [(user, day, metric, float(value)) for day, metric, value in rows]
+        self.conn.executemany("""
+            INSERT INTO team_stats (user, day, metric, value) VALUES (?, ?, ?, ?)
+            ON CONFLICT (user, day, metric) DO UPDATE SET value = excluded.value
+        """, rows)
+        self._rebuild_user_rollups(user)
+        return len(rows)
+
+    def _rebuild_user_rollups(self, user):
+        """Recomputes all rollups of one user (caller holds the transaction)."""
+        totals = {}
+        buckets = {}  # day -> its (period, bucket) pairs, computed once per day
+        for day, metric, value in self.conn.execute(
+                "SELECT day, metric, value FROM team_stats WHERE user = ?", (user,)):
+            if day not in buckets:
+                buckets[day] = [(period, period_key(period, day)) for period in PERIODS]
+            for period, bucket in buckets[day]:
+                key = (period, bucket, user, metric)
+                totals[key] = totals.get(key, 0.0) + value
+        self.conn.execute("DELETE FROM team_rollups WHERE user = ?", (user,))
+        self.conn.executemany(
+            "INSERT INTO team_rollups (period, bucket, user, metric, total) VALUES (?, ?, ?, ?, ?)",
+            [key + (total,) for key, total in totals.items()])
+
+    def import_file(self, path, user=None):
+        return self.import_rows(user or user_for_path(path), read_stats_file(path))
+
+    def import_paths(self, paths, user=None):
+        """
+        Imports every stats file under 'paths' (files or directories).
+        Generator for Worker: yields (done, total, path) per file and
+        returns {user: rows imported}.
+        """
+        files = list(find_stats_files(paths))
+        imported = {}
+        # One transaction for the whole import: a commit per file costs more
+        # than the inserts. Each file gets a savepoint, so a file that fails
+        # halfway leaves nothing behind.
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")  # otherwise releasing the first savepoint would commit
+            for done, path in enumerate(files, start=1):
+                name = user or user_for_path(path)
+                self.conn.execute("SAVEPOINT import_file")
+                try:
+                    rows = list(read_stats_file(path))
+                    count = self._import_rows(name, rows)
+                except (OSError, ValueError, AttributeError, sqlite3.Error) as e:
+                    self.conn.execute("ROLLBACK TO import_file")
+                    print(f"[TeamStats] Skipped {path}: {e}")
+                else:
+                    imported[name] = imported.get(name, 0) + count
+                self.conn.execute("RELEASE import_file")
+                yield (done, len(files), str(path))
+        return imported
+
+    def users(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT user FROM team_stats ORDER BY user")]
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM team_stats LIMIT 1").fetchone() is None
+
+    def team_index(self):
+        """StatsIndex of the team's daily totals (sum over users)."""
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT day, metric, SUM(value) FROM team_stats
+                GROUP BY day, metric ORDER BY day
+            """).fetchall()
+        return StatsIndex.from_rows(rows)
+
+    def user_totals(self, start=None, end=None):
+        """{user: {metric: total}} for start <= day <= end (ISO dates, inclusive)."""
+        conditions, params = [], []
+        if start:
+            conditions.append("day >= ?")
+            params.append(start)
+        if end:
+            conditions.append("day <= ?")
+            params.append(end)
+        query = "SELECT user, metric, SUM(value) FROM team_stats"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY user, metric"
+        breakdown = {}
+        with self.lock:
+            for user, metric, total in self.conn.execute(query, params):
+                breakdown.setdefault(user, {})[metric] = total
+        return breakdown
+
+    def period_totals(self, period, day):
+        """{user: {metric: total}} of the day/week/month bucket containing 'day'."""
+        breakdown = {}
+        with self.lock:
+            for user, metric, total in self.conn.execute(
+                    "SELECT user, metric, total FROM team_rollups WHERE period = ? AND bucket = ?",
+                    (period, period_key(period, day))):
+                breakdown.setdefault(user, {})[metric] = total
+        return breakdown
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def team_totals(breakdown):
+    """Sums a {user: {metric: total}} breakdown into {metric: total}."""
+    totals = {}
+    for metrics in breakdown.values():
+        for metric, total in metrics.items():
+            totals[metric] = totals.get(metric, 0.0) + total
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge intern statistics into the team database.")
+    parser.add_argument("--db", default=str(TEAM_DB_FILE), help="team database (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="import stats files or folders")
+    import_cmd.add_argument("paths", nargs="+")
+    import_cmd.add_argument("--user", help="user name for all files (default: folder or file name)")
+
+    summary_cmd = commands.add_parser("summary", help="print team totals and the per-user breakdown")
+    summary_cmd.add_argument("--period", choices=PERIODS, help="only the bucket containing --day")
+    summary_cmd.add_argument("--day", help="ISO date inside the period (default: today)")
+    args = parser.parse_args(argv)
+
+    store = TeamStore(args.db)
+    if args.command == "import":
+        started = time.perf_counter()
+        steps = store.import_paths(args.paths, args.user)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                imported = stop.value
+                break
+        for user, count in sorted(imported.items()):
+            print(f"{user}: {count} rows")
+        print(f"Imported {len(imported)} users in {time.perf_counter() - started:.2f}s")
+    else:
+        if args.period:
+            breakdown = store.period_totals(args.period, args.day or time.strftime("%Y-%m-%d"))
+        else:
+            breakdown = store.user_totals()
+        for user, metrics in sorted(breakdown.items()):
+            print(f"{user}: " + ", ".join(f"{m}={v:g}" for m, v in sorted(metrics.items())))
+        print("TEAM: " + ", ".join(f"{m}={v:g}" for m, v in sorted(team_totals(breakdown).items())))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
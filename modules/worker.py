@@ -1,9 +1,12 @@
-from PyQt5.QtCore import QObject, pyqtSignal
+import inspect
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
 
 class Worker(QObject):
     """
     A generic worker for running a function (especially a generator)
-    in a separate thread.
+    in a separate thread. Each tuple a generator yields is emitted through
+    'progress'; its return value is emitted through 'finished'.
     """
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
@@ -18,6 +21,51 @@ class Worker(QObject):
     def run(self):
         try:
             result = self.func(*self.args, **self.kwargs)
+            if inspect.isgenerator(result):
+                result = self.drain(result)
             self.finished.emit(result)
         except Exception as e:
             self.error.emit(str(e))
+
+    def drain(self, generator):
+        while True:
+            try:
+                self.progress.emit(next(generator))
+            except StopIteration as stop:
+                return stop.value
+
+
+def start_worker(func, *args, on_finished=None, on_error=None, on_progress=None, on_done=None):
+    """
+    Runs func(*args) in a Worker on a new QThread and returns (thread, worker).
+    The caller must keep both referenced until the thread has finished.
+    'on_done' is connected to the thread's finished signal (after either outcome).
+    """
+    thread = QThread()
+    worker = Worker(func, *args)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    if on_progress is not None:
+        worker.progress.connect(on_progress)
+    if on_finished is not None:
+        worker.finished.connect(on_finished)
+    if on_error is not None:
+        worker.error.connect(on_error)
+    worker.finished.connect(thread.quit)
+    worker.error.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    if on_done is not None:
+        thread.finished.connect(on_done)
+    thread.start()
+    return thread, worker
+
+
+def stop_thread(thread):
+    """
+    Blocks until a start_worker thread is done. quit() comes first: the
+    worker's finished->quit is queued to this (blocked) thread, so without
+    it wait() would never return.
+    """
+    if thread is not None and thread.isRunning():
+        thread.quit()
+        thread.wait()
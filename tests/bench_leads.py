@@ -0,0 +1,104 @@
+# tests/bench_leads.py
+
+"""
+Headless regression run and benchmark for lead parsing.
+
+Runs language detection and field extraction over the anonymized corpus in
+tests/corpus/leads_corpus.json without creating any QWidget, then reports
+the accuracy per field and the parsing throughput (messages/sec).
+
+Usage (from the repo root):
+    python tests/bench_leads.py
+    python tests/bench_leads.py --rules regex/parsing_rules.json --repeat 200
+    python tests/bench_leads.py --min-accuracy 0.9 --json results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from modules.lead_core import FIELDS, RULE_TIMEOUT, detect_language, parse_input
+
+DEFAULT_CORPUS = os.path.join(ROOT_DIR, "tests", "corpus", "leads_corpus.json")
+DEFAULT_RULES = os.path.join(ROOT_DIR, "regex", "parsing_rules.json")
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def evaluate(corpus, rules, timeout):
+    """Returns (per-field accuracy dict, list of mismatches)."""
+    correct = dict.fromkeys(("language",) + FIELDS, 0)
+    mismatches = []
+    for case in corpus:
+        language = detect_language(case["text"], rules)
+        parsed = parse_input(case["text"], rules, timeout=timeout)
+        got = dict(parsed, language=language)
+        expected = dict(case["expected"], language=case["language"])
+        for field in correct:
+            if got[field] == expected[field]:
+                correct[field] += 1
+            else:
+                mismatches.append((case["id"], field, expected[field], got[field]))
+    total = len(corpus) or 1
+    return {field: hits / total for field, hits in correct.items()}, mismatches
+
+
+def benchmark(corpus, rules, repeat, timeout):
+    texts = [case["text"] for case in corpus]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            detect_language(text, rules)
+            parse_input(text, rules, timeout=timeout)
+    elapsed = time.perf_counter() - start
+    return (len(texts) * repeat) / elapsed if elapsed else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lead parsing accuracy and speed report.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--rules", default=DEFAULT_RULES)
+    parser.add_argument("--repeat", type=int, default=50, help="Passes over the corpus for the speed run")
+    parser.add_argument("--no-guard", action="store_true", help="Run rules without the timeout guard")
+    parser.add_argument("--min-accuracy", type=float, default=0.0,
+                        help="Exit with code 1 if any field falls below this accuracy")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    corpus = load_json(args.corpus)
+    rules = load_json(args.rules)
+    timeout = None if args.no_guard else RULE_TIMEOUT
+
+    accuracy, mismatches = evaluate(corpus, rules, timeout)
+    throughput = benchmark(corpus, rules, args.repeat, timeout)
+
+    print(f"Corpus: {len(corpus)} messages | Rules: {args.rules}")
+    print("-" * 40)
+    for field, value in accuracy.items():
+        print(f"{field:<10} {value:7.1%}")
+    print("-" * 40)
+    print(f"Throughput: {throughput:,.0f} messages/sec")
+    if mismatches:
+        print("\nMismatches:")
+        for case_id, field, expected, got in mismatches:
+            print(f"  [{case_id}] {field}: expected {expected!r}, got {got!r}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"accuracy": accuracy, "messages_per_sec": throughput,
+                       "mismatches": mismatches}, f, indent=2, ensure_ascii=False)
+
+    if min(accuracy.values()) < args.min_accuracy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
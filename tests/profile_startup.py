@@ -0,0 +1,275 @@
+# tests/profile_startup.py
+
+"""
+Headless startup and interaction profiler.
+
+Builds MainWindow under QT_QPA_PLATFORM=offscreen, skipping the login
+dialog as `main.py --skip-login` does, and times:
+  - process start to MainWindow.show (split into imports, window
+    construction and show) and the first paint of the window,
+  - the construction and first paint of every tab, in notebook order,
+  - a few scripted actions: theme toggles, paging through the whole
+    temporal log and log searches.
+
+The app runs in a temporary working directory: other/ is copied there
+and every other top-level entry of the repo is linked, so migrations and
+indexes built on the way never touch the real data. Modal dialogs (e.g.
+a missing resources/tech_specs.json) are dismissed automatically and
+counted in the results.
+
+Usage (from the repo root):
+    python tests/profile_startup.py
+    python tests/profile_startup.py --json timings.json --profile startup.prof
+    python tests/profile_startup.py --tabs "Temporal Logs" Statistics --search machine lathe
+
+The .prof file opens with `python -m pstats`, snakeviz or flameprof. For a
+flamegraph of the real entry point, run it under a sampling profiler:
+    QT_QPA_PLATFORM=offscreen py-spy record -o flame.svg -- python main.py --skip-login
+"""
+
+import time
+
+PROCESS_START = time.perf_counter()
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+PAINT_TIMEOUT = 5.0  # seconds to wait for a first paint
+DIALOG_POLL_MS = 100
+
+
+def make_workdir():
+    """
+    Temporary copy of the repo root for the run: the app loads resources/,
+    other/, ... relative to the working directory. other/ is copied (the app
+    writes there); the rest is linked, or copied where links are not allowed.
+    """
+    workdir = tempfile.mkdtemp(prefix="profile_startup_")
+    for name in os.listdir(ROOT_DIR):
+        source = os.path.join(ROOT_DIR, name)
+        target = os.path.join(workdir, name)
+        if name.startswith("."):
+            continue
+        if name == "other":
+            shutil.copytree(source, target)
+            continue
+        try:
+            os.symlink(source, target, target_is_directory=os.path.isdir(source))
+        except OSError:
+            if os.path.isdir(source):
+                shutil.copytree(source, target)
+            else:
+                shutil.copy2(source, target)
+    os.makedirs(os.path.join(workdir, "other"), exist_ok=True)  # a fresh clone may have none
+    return workdir
+
+
+def dismiss_modal_dialogs(app, counter):
+    """Closes any modal dialog (they would block forever offscreen); returns the polling timer."""
+    from PyQt5.QtCore import QTimer
+
+    def close_modal():
+        dialog = app.activeModalWidget()
+        if dialog is not None:
+            counter.append(dialog.windowTitle())
+            dialog.close()
+
+    timer = QTimer()
+    timer.timeout.connect(close_modal)
+    timer.start(DIALOG_POLL_MS)
+    return timer
+
+
+def ms_since(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def wait_for_paint(app, widget, timeout=PAINT_TIMEOUT):
+    """Processes events until 'widget' receives a paint event; returns the wait in ms, or None on timeout."""
+    from PyQt5.QtCore import QEvent, QObject
+
+    class PaintWatcher(QObject):
+        painted = False
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                self.painted = True
+            return False
+
+    watcher = PaintWatcher()
+    widget.installEventFilter(watcher)
+    start = time.perf_counter()
+    while not watcher.painted and time.perf_counter() - start < timeout:
+        app.processEvents()
+    widget.removeEventFilter(watcher)
+    return ms_since(start) if watcher.painted else None
+
+
+def timed_tab_builds(MainWindow, timings):
+    """Wraps MainWindow.build_tab to record, per tab name, how long building it took."""
+    build_tab = MainWindow.build_tab
+
+    def build_and_time(self, index):
+        if index not in self.tab_factories:
+            return build_tab(self, index)
+        name = self.tab_factories[index][0]
+        start = time.perf_counter()
+        build_tab(self, index)
+        timings.setdefault(name, {})["build_ms"] = ms_since(start)
+
+    MainWindow.build_tab = build_and_time
+
+
+def run_actions(app, window, queries):
+    """Scripted interactions; returns {action: ms}."""
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(2):
+        window.toggle_dark_mode()
+        app.processEvents()
+    results["toggle_theme_x2_ms"] = ms_since(start)
+
+    log_tab = None
+    for i in range(window.notebook.count()):
+        if window.notebook.tabText(i) == "Temporal Logs":
+            window.notebook.setCurrentIndex(i)
+            log_tab = window.notebook.widget(i)
+    if log_tab is None:
+        return results
+    app.processEvents()
+
+    # Wait for the background index update, so searches hit a complete index.
+    # Its finished->quit is delivered through this thread's event loop, so
+    # poll instead of blocking in wait().
+    if log_tab.index_thread is not None:
+        start = time.perf_counter()
+        while log_tab.index_thread.isRunning():
+            app.processEvents()
+            time.sleep(0.005)
+        results["log_index_catch_up_wait_ms"] = ms_since(start)
+
+    start = time.perf_counter()
+    pages = 0
+    while log_tab.reader.has_more:
+        log_tab.load_older_page()
+        app.processEvents()
+        pages += 1
+    results["log_load_all_pages_ms"] = ms_since(start)
+    results["log_pages"] = pages
+    results["log_entries"] = len(log_tab.model.entries)
+
+    for query in queries:
+        start = time.perf_counter()
+        log_tab.search_input.setText(query)
+        log_tab.run_search()
+        app.processEvents()
+        results[f"log_search[{query}]_ms"] = ms_since(start)
+    log_tab.search_input.clear()
+    log_tab.run_search()
+    return results
+
+
+def profile(args):
+    results = {"python": platform.python_version(), "platform": platform.platform()}
+
+    start = time.perf_counter()
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication
+    import main as app_main
+    results["import_ms"] = ms_since(start)
+
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    app = QApplication(sys.argv[:1])
+    app.setStyle("Fusion")
+    dismissed = []
+    dialog_timer = dismiss_modal_dialogs(app, dismissed)
+
+    tabs = {}
+    timed_tab_builds(app_main.MainWindow, tabs)
+    start = time.perf_counter()
+    window = app_main.MainWindow()
+    results["main_window_init_ms"] = ms_since(start)
+
+    start = time.perf_counter()
+    window.show()
+    results["show_ms"] = ms_since(start)
+    results["process_start_to_show_ms"] = ms_since(PROCESS_START)
+    results["first_paint_ms"] = wait_for_paint(app, window)
+    results["process_start_to_first_paint_ms"] = ms_since(PROCESS_START)
+
+    # The first tab was built (and painted) with the window
+    first = window.notebook.tabText(window.notebook.currentIndex())
+    tabs.setdefault(first, {})["first_paint_ms"] = results["first_paint_ms"]
+    for i in range(window.notebook.count()):
+        name = window.notebook.tabText(i)
+        if name == first or (args.tabs and name not in args.tabs):
+            continue
+        window.notebook.setCurrentIndex(i)
+        tabs[name]["first_paint_ms"] = wait_for_paint(app, window.notebook.widget(i))
+    results["tabs"] = tabs
+
+    if not args.no_actions:
+        results["actions"] = run_actions(app, window, args.search)
+
+    window.close()
+    app.processEvents()
+    dialog_timer.stop()
+    results["dismissed_dialogs"] = dismissed
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless startup and interaction timings.")
+    parser.add_argument("--json", help="Write the timings to this JSON file")
+    parser.add_argument("--profile", help="Also write cProfile stats of the whole run to this file")
+    parser.add_argument("--tabs", nargs="+", help="Only open these tabs (default: all)")
+    parser.add_argument("--search", nargs="+", default=["machine", "lathe machine", "ma"],
+                        help="Log search queries to time")
+    parser.add_argument("--no-actions", action="store_true", help="Skip the scripted actions")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the temporary working directory")
+    args = parser.parse_args()
+    # Output paths are relative to where the harness was started, not to the work directory
+    args.json = args.json and os.path.abspath(args.json)
+    args.profile = args.profile and os.path.abspath(args.profile)
+
+    workdir = make_workdir()
+    os.chdir(workdir)
+    print(f"Working directory: {workdir}", file=sys.stderr)
+    try:
+        results = run(args)
+    finally:
+        os.chdir(ROOT_DIR)
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+def run(args):
+    if args.profile:
+        profiler = cProfile.Profile()
+        results = profiler.runcall(profile, args)
+        profiler.dump_stats(args.profile)
+    else:
+        results = profile(args)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# tests/test_import_time.py
+
+"""
+Import-time regression test.
+
+Runs `python -X importtime` on main.py in a fresh interpreter and checks
+that none of the heavy feature dependencies are loaded at startup and that
+the whole import stays within a time budget. Qt-free modules are checked
+the same way, so that test still runs where PyQt5 is not installed.
+
+Usage (from the repo root):
+    python -m pytest tests/test_import_time.py
+    IMPORT_BUDGET_MS=800 python -m unittest tests.test_import_time
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only when the feature that needs them is first used
+DEFERRED = (
+    "bs4", "requests", "cryptography", "fpdf", "PyQt5.QtChart", "pyautogui", "pyarrow", "numpy",
+    # Tabs other than the first one are imported when they are opened
+    "modules.log_tab", "modules.stats", "modules.html_parser", "modules.spreadsheet",
+)
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 1500))
+
+
+def import_times(module):
+    """{module name: cumulative import time in ms} for importing 'module' in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise AssertionError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def assert_deferred(self, times, module):
+        loaded = sorted(name for name in times if name.split(".")[0] in DEFERRED or name in DEFERRED)
+        self.assertEqual(loaded, [], f"imported at startup by {module}")
+
+    @unittest.skipUnless(importlib.util.find_spec("PyQt5"), "PyQt5 is not installed")
+    def test_main_defers_heavy_imports(self):
+        times = import_times("main")
+        self.assert_deferred(times, "main")
+        self.assertLess(times["main"], IMPORT_BUDGET_MS,
+                        f"importing main took {times['main']:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+    def test_qt_free_modules_defer_heavy_imports(self):
+        for module in ("modules.log_crypto", "modules.log_store", "modules.log_index", "modules.stats_export"):
+            with self.subTest(module=module):
+                self.assert_deferred(import_times(module), module)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_log_index.py
+
+"""
+Full-text search over the temporal log, and the keyword matcher behind
+lead language detection.
+
+Usage (from the repo root):
+    python -m pytest tests/test_log_index.py
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.lang_detect import LanguageDetector
+from modules.log_index import LogIndex
+from modules.log_store import LogStore
+
+
+class LogIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.store = LogStore(root / "temporal_log", legacy_text=None)
+        self.store.append_many([("t", False, "Called the Berlin dealer about the lathe"),
+                                ("t", True, "gAAAAencrypted-token"),
+                                ("t", False, "Lathe quote sent to Munich")])
+        self.index = LogIndex(self.store, root / "temporal_log.idx")
+        self.index.catch_up()
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_search_after_catch_up(self):
+        self.assertEqual(sorted(self.index.search("lathe")), [0, 2])
+        self.assertEqual(self.index.search("lathe berlin"), [0])
+        self.assertEqual(self.index.search("encrypted"), [])  # encrypted entries stay out of the index
+
+    def test_search_after_append(self):
+        number = self.store.append("t", False, "Berlin lathe shipped")
+        self.index.add_entry(number, "Berlin lathe shipped")
+        self.assertEqual(sorted(self.index.search("berlin")), [0, number])
+        self.assertEqual(self.index.search("ship"), [number])  # prefix match
+
+    def test_decrypted_entries_are_searchable(self):
+        self.index.add_decrypted(1, "Private note about Hamburg")
+        self.assertEqual(self.index.search("hamburg"), [1])
+
+    def test_rebuilds_after_renumbering(self):
+        self.store.clear()
+        self.store.append("t", False, "only entry")
+        self.index.catch_up()
+        self.assertEqual(self.index.search("lathe"), [])
+        self.assertEqual(self.index.search("entry"), [0])
+
+
+class LanguageDetectorTest(unittest.TestCase):
+    RULES = [
+        {"type": "language_detect", "value": "fr", "pattern": "bonjour|votre intérêt|localisation"},
+        {"type": "language_detect", "value": "it", "pattern": "buongiorno|gentile|località"},
+        {"type": "language_detect", "value": "de", "pattern": r"guten tag|\bstandort\b"},
+    ]
+
+    def test_keywords_are_counted_in_one_pass(self):
+        detector = LanguageDetector(self.RULES)
+        self.assertEqual(detector.scores("Bonjour, merci pour votre intérêt. Localisation : Lyon"),
+                         {"fr": 3, "it": 0, "de": 0})
+        self.assertEqual(detector.detect("Buongiorno gentile cliente, bonjour"), ("it", 2 / 3))
+
+    def test_overlapping_keywords(self):
+        detector = LanguageDetector([{"type": "language_detect", "value": "x", "pattern": "ab|b|abc"}])
+        self.assertEqual(detector.scores("abc")["x"], 3)
+
+    def test_regex_patterns_and_default(self):
+        detector = LanguageDetector(self.RULES)
+        self.assertEqual(detector.detect("Guten Tag! Standort: Berlin")[0], "de")
+        self.assertEqual(detector.detect("Hello there"), ("en", 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# tests/test_log_store.py
+
+"""
+Framed temporal log storage: reading back, recovery after a crash,
+compaction and tail paging.
+
+Usage (from the repo root):
+    python -m pytest tests/test_log_store.py
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.log_store import FRAME, LogStore, TailReader
+
+
+class LogStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name) / "temporal_log"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **kwargs):
+        return LogStore(self.base, legacy_text=None, **kwargs)
+
+    def messages(self, store):
+        return [message for _, _, _, message in store.read_range(0, store.count())]
+
+    def test_messages_round_trip(self):
+        store = self.open()
+        odd = "line one\nline two ||| ENC ||| ünïcode"
+        store.append("2025-06-01 10:00:00", False, "plain")
+        store.append("2025-06-01 10:00:01", True, odd)
+        self.assertEqual(store.read_range(0, 2), [(0, "2025-06-01 10:00:00", False, "plain"),
+                                                  (1, "2025-06-01 10:00:01", True, odd)])
+        self.assertEqual(self.messages(self.open()), ["plain", odd])
+
+    def test_truncated_frame_is_cut_off_on_open(self):
+        store = self.open()
+        store.append_many([("t", False, f"m{i}") for i in range(3)])
+        segment = store.segments[-1]
+        with open(segment.path, "ab") as f:
+            f.write(FRAME.pack(100, 0) + b"torn")  # a frame whose write never finished
+        size_before = segment.size()
+
+        store = self.open()
+        self.assertEqual(self.messages(store), ["m0", "m1", "m2"])
+        self.assertLess(store.segments[-1].size(), size_before)
+        store.append("t", False, "m3")
+        self.assertEqual(self.messages(self.open()), ["m0", "m1", "m2", "m3"])
+
+    def test_frames_written_without_their_offset_are_recovered(self):
+        store = self.open()
+        store.append_many([("t", False, f"m{i}") for i in range(3)])
+        offsets = store.segments[-1].offsets_path
+        with open(offsets, "r+b") as f:
+            f.truncate(os.path.getsize(offsets) - 8)  # the last offset never reached the disk
+
+        self.assertEqual(self.messages(self.open()), ["m0", "m1", "m2"])
+
+    def test_compact_drops_corrupted_frames_and_renumbers(self):
+        store = self.open(max_segment_bytes=200)
+        store.append_many([("t", False, f"message {i}") for i in range(20)])
+        self.assertGreater(len(store.segments), 1)
+        path = store.segments[1].path
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF  # corrupts the last frame of that segment
+        path.write_bytes(bytes(data))
+        generation = store.generation
+
+        kept, dropped = store.compact()
+
+        self.assertEqual((kept, dropped), (19, 1))
+        self.assertNotEqual(store.generation, generation)
+        self.assertEqual(self.messages(self.open(max_segment_bytes=200)), self.messages(store))
+        self.assertEqual([number for number, _, _, _ in store.read_range(0, 19)], list(range(19)))
+
+    def test_unreferenced_segment_set_is_ignored_and_deleted(self):
+        store = self.open()
+        store.append_many([("t", False, "kept")])
+        # Left by a compaction that died before switching the manifest
+        stray = self.base.with_name(f"{self.base.name}.c1.000001.log")
+        stray.write_bytes(b"partial")
+
+        store = self.open()
+        self.assertEqual(self.messages(store), ["kept"])
+        self.assertFalse(stray.exists())
+
+    def test_tail_reader_pages_backwards_and_forwards(self):
+        store = self.open()
+        store.append_many([("t", False, str(i)) for i in range(10)])
+        reader = TailReader(store, page_size=4)
+        self.assertEqual([m for _, _, _, m in reader.read_page()], ["6", "7", "8", "9"])
+        self.assertEqual([m for _, _, _, m in reader.read_page()], ["2", "3", "4", "5"])
+        self.assertFalse(reader.has_newer)
+
+        reader.end = 6  # the caller dropped its newest page
+        self.assertTrue(reader.has_newer)
+        self.assertEqual([m for _, _, _, m in reader.read_newer_page()], ["6", "7", "8", "9"])
+        self.assertEqual([m for _, _, _, m in reader.read_page()], ["0", "1"])
+        self.assertFalse(reader.has_more)
+
+
+if __name__ == "__main__":
+    unittest.main()
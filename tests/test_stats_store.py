@@ -0,0 +1,99 @@
+# tests/test_stats_store.py
+
+"""
+SQLite statistics storage: rollups kept in step with saves, automatic
+counter batches and the one-time import of the legacy JSON file.
+
+Usage (from the repo root):
+    python -m pytest tests/test_stats_store.py
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.stats_store import StatsStore
+
+
+class StatsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db = self.dir / "stats.db"
+        self.json = self.dir / "stats_progress.json"
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.tmp.cleanup()
+
+    def open(self, legacy_json=None):
+        store = StatsStore(self.db, legacy_json=legacy_json)
+        self.stores.append(store)
+        return store
+
+    def test_rollups_follow_upserts_and_clear(self):
+        store = self.open()
+        store.upsert_day("2025-06-02", {"Contacts": "3", "Metabase": "1"})
+        store.upsert_day("2025-06-03", {"Contacts": "4"})
+        store.upsert_day("2025-06-02", {"Contacts": "5"})  # replaces 3: the rollups move by +2
+
+        self.assertEqual(store.period_totals("day", "2025-06-02"), {"Contacts": 5.0, "Metabase": 1.0})
+        self.assertEqual(store.period_totals("week", "2025-06-04"), {"Contacts": 9.0, "Metabase": 1.0})
+        self.assertEqual(store.period_totals("month", "2025-06-30"), {"Contacts": 9.0, "Metabase": 1.0})
+
+        store.clear()
+        self.assertEqual(store.period_totals("month", "2025-06-30"), {})
+        store.upsert_day("2025-06-02", {"Contacts": "1"})
+        self.assertEqual(store.period_totals("month", "2025-06-30"), {"Contacts": 1.0})
+
+    def test_rebuilt_rollups_match_incremental_ones(self):
+        store = self.open()
+        store.upsert_day("2025-05-31", {"Contacts": "2"})
+        store.upsert_day("2025-06-01", {"Contacts": "3"})
+        store.add_counts({("2025-06-01", "Contacts"): 1})
+        incremental = [store.period_totals(period, "2025-06-01") for period in ("day", "week", "month")]
+        store.rebuild_rollups()
+        self.assertEqual([store.period_totals(period, "2025-06-01") for period in ("day", "week", "month")],
+                         incremental)
+
+    def test_batches_are_applied_once(self):
+        store = self.open()
+        counts = {("2025-06-01", "Template Leads"): 2}
+        self.assertTrue(store.add_counts(counts, "100.000000"))
+        self.assertFalse(store.add_counts(counts, "100.000000"))  # replayed after a crash
+        self.assertTrue(store.add_counts(counts, "101.000000"))
+        self.assertEqual(store.get_day("2025-06-01"), {"Template Leads": "4"})
+        count = store.conn.execute("SELECT COUNT(*) FROM meta WHERE key LIKE '%batch%'").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_legacy_json_is_imported_once_and_left_in_place(self):
+        self.json.write_text(json.dumps({
+            "2025-06-01": {"Contacts": "5", "Metabase": "x"},
+            "06/02/2025": {"Contacts": "9"},
+        }), encoding="utf-8")
+        store = self.open()
+        store.add_counts({("2025-06-01", "Contacts"): 2})  # recorded before the tab first opened
+        store.close()
+
+        store = self.open(self.json)
+        self.assertEqual(store.range(), {"2025-06-01": {"Contacts": "7"}})
+        self.assertEqual(store.period_totals("month", "2025-06-01"), {"Contacts": 7.0})
+        self.assertTrue(self.json.exists())
+        self.assertEqual(len(store.warnings), 1)  # the invalid day
+        store.close()
+
+        self.assertEqual(self.open(self.json).range(), {"2025-06-01": {"Contacts": "7"}})
+
+    def test_unreadable_legacy_json_is_reported(self):
+        self.json.write_text('{"2025-06-01": {"Contacts": "5"},', encoding="utf-8")
+        store = self.open(self.json)
+        self.assertTrue(store.is_empty())
+        self.assertEqual(len(store.warnings), 1)
+        self.assertFalse(store.is_migrated())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# tests/test_team_stats.py
+
+"""
+Team statistics import: bad member files must not leave rows behind that
+break the team views.
+
+Usage (from the repo root):
+    python -m pytest tests/test_team_stats.py
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.team_stats import TeamStore
+
+
+def drain(steps):
+    """Runs an import_paths generator to the end and returns its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class TeamImportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.exports = self.dir / "exports"
+        self.exports.mkdir()
+        self.store = TeamStore(self.dir / "team.db")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        (self.exports / name).write_text(data if isinstance(data, str) else json.dumps(data), encoding="utf-8")
+
+    def test_bad_files_next_to_a_good_one(self):
+        self.write("alice.json", {"2025-06-01": {"Contacts": "3"}, "2025-06-02": {"Contacts": "4"}})
+        self.write("bob.json", {"06/01/2025": {"Contacts": "5"}, "2025-06-02": {"Contacts": "1"}})
+        self.write("carol.json", '{"2025-06-01": {"Contacts": "2"},')  # truncated by a hand edit
+
+        imported = drain(self.store.import_paths([self.exports]))
+
+        self.assertEqual(imported, {"alice": 2, "bob": 1})
+        self.assertEqual(self.store.user_totals(), {"alice": {"Contacts": 7.0}, "bob": {"Contacts": 1.0}})
+        self.assertEqual(self.store.period_totals("month", "2025-06-15"),
+                         {"alice": {"Contacts": 7.0}, "bob": {"Contacts": 1.0}})
+        index = self.store.team_index()
+        self.assertEqual([day.isoformat() for day in index.dates], ["2025-06-01", "2025-06-02"])
+
+    def test_invalid_days_already_stored_are_dropped_on_open(self):
+        self.store.import_rows("bob", [("2025-06-02", "Contacts", 1)])
+        with self.store.conn:
+            self.store.conn.execute(
+                "INSERT INTO team_stats (user, day, metric, value) VALUES ('bob', '06/01/2025', 'Contacts', 5)")
+        self.store.close()
+
+        self.store = TeamStore(self.dir / "team.db")
+        self.assertEqual(self.store.user_totals(), {"bob": {"Contacts": 1.0}})
+        self.assertEqual(len(self.store.team_index().dates), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()